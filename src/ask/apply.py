@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 
+import io
+import os
 import subprocess
 from dataclasses import dataclass
 from pathlib import Path
 
+from ask.check import run_shell, truncate_output
 from ask.errors import AskError
 from ask.extract import CommandBlock, FileBlock, extract_command_blocks, extract_file_blocks
-from ask.parser import find_input_marker
-from ask.session import read_session
+from ask.output import output
+from ask.parser import find_last_turn
+from ask.session import SessionEditor
 from ask.workspace import find_workspace, resolve_path
 
 
@@ -23,6 +27,15 @@ class FileResult:
     error: str | None = None
 
 
+@dataclass
+class PreparedFile:
+    """A file block resolved and encoded, ready to write."""
+
+    path: str
+    resolved: Path
+    encoded: bytes
+
+
 @dataclass
 class CommandResult:
     """Result of executing a command."""
@@ -46,6 +59,7 @@ def apply_session(
     dry_run: bool = False,
     apply_files: bool = True,
     apply_commands: bool = True,
+    editor: SessionEditor | None = None,
 ) -> ApplyResult:
     """Apply files and commands from last AI turn.
 
@@ -54,25 +68,28 @@ def apply_session(
         dry_run: If True, preview without writing/executing
         apply_files: If True, extract and write files
         apply_commands: If True, execute commands
+        editor: Open editor to read session content from (reads file if None)
 
     Returns:
         ApplyResult with file and command results
     """
-    # Read session and find last AI turn
-    session = read_session(session_path)
-
-    # Find last AI turn
-    ai_turn = None
-    for turn in reversed(session.turns):
-        if turn.role == "AI":
-            ai_turn = turn
-            break
+    if editor is None:
+        with SessionEditor(session_path) as session_editor:
+            return apply_session(
+                session_path,
+                dry_run=dry_run,
+                apply_files=apply_files,
+                apply_commands=apply_commands,
+                editor=session_editor,
+            )
+
+    # Find last AI turn without materializing the others
+    session_content = editor.content
+    ai_turn = find_last_turn(session_content, "AI")
 
     if ai_turn is None:
         raise AskError("No AI response to apply", "Run 'ask' first to get an AI response")
 
-    # Read session content for workspace marker
-    session_content = Path(session_path).read_text(encoding="utf-8")
     workspace = find_workspace(session_content)
 
     # Extract blocks from AI turn
@@ -85,11 +102,9 @@ def apply_session(
             "AI response has no <!-- file: --> or <!-- ask:command --> blocks",
         )
 
-    # Apply files
-    file_results: list[FileResult] = []
-    for block in file_blocks:
-        result = _write_file(block, workspace, dry_run)
-        file_results.append(result)
+    # Apply files: resolve and encode the whole batch first, then write it in one pass
+    prepared = [_prepare_file(block, workspace) for block in file_blocks]
+    file_results = [_write_file(file, dry_run) for file in prepared]
 
     # Apply commands
     command_results: list[CommandResult] = []
@@ -114,27 +129,57 @@ def apply_session(
     )
 
 
-def _write_file(block: FileBlock, workspace: Path | None, dry_run: bool) -> FileResult:
-    """Write a file block to disk."""
-    resolved = resolve_path(block.path, workspace)
+def _prepare_file(block: FileBlock, workspace: Path | None) -> PreparedFile:
+    """Resolve and encode a file block ahead of writing."""
+    # Encode once: the same bytes give the size and get written
+    return PreparedFile(
+        path=block.path,
+        resolved=resolve_path(block.path, workspace),
+        encoded=block.content.encode("utf-8"),
+    )
 
-    # Determine action
-    action = "updated" if resolved.exists() else "created"
-    size = len(block.content.encode("utf-8"))
+
+def _write_file(file: PreparedFile, dry_run: bool) -> FileResult:
+    """Write a prepared file to disk."""
+    size = len(file.encoded)
 
     if dry_run:
-        return FileResult(path=block.path, action=action, size=size)
+        action = "updated" if file.resolved.exists() else "created"
+        return FileResult(path=file.path, action=action, size=size)
 
     try:
-        # Create parent directories
-        resolved.parent.mkdir(parents=True, exist_ok=True)
-
-        # Write file
-        resolved.write_text(block.content, encoding="utf-8")
+        action, fd = _open_for_write(file.resolved)
+        with os.fdopen(fd, "wb") as f:
+            f.write(file.encoded)
 
-        return FileResult(path=block.path, action=action, size=size)
+        return FileResult(path=file.path, action=action, size=size)
     except Exception as e:
-        return FileResult(path=block.path, action="FAILED", size=0, error=str(e))
+        return FileResult(path=file.path, action="FAILED", size=0, error=str(e))
+
+
+def _open_for_write(path: Path) -> tuple[str, int]:
+    """Open a file for writing, detecting the action from the open itself.
+
+    Tries an exclusive create first, so no separate stat is needed:
+    success means "created", an existing file is truncated as "updated".
+    Parent directories are only created when the open reports them missing.
+    A dangling symlink (or a file deleted between the two opens) gets its
+    target created, as write_text() would.
+    """
+    binary = getattr(os, "O_BINARY", 0)  # Windows needs this for untranslated writes
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | binary, 0o666)
+        return "created", fd
+    except FileExistsError:
+        try:
+            return "updated", os.open(path, os.O_WRONLY | os.O_TRUNC | binary)
+        except FileNotFoundError:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | binary, 0o666)
+            return "created", fd
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | binary, 0o666)
+        return "created", fd
 
 
 def _execute_command(block: CommandBlock, workspace: Path | None, dry_run: bool) -> CommandResult:
@@ -146,22 +191,15 @@ def _execute_command(block: CommandBlock, workspace: Path | None, dry_run: bool)
         # Determine working directory
         cwd = workspace if workspace else Path.cwd()
 
-        # Execute command
-        result = subprocess.run(
-            block.command,
-            shell=True,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=300,  # 5 minute timeout
-        )
+        # Execute command (stderr is merged into output)
+        returncode, output = run_shell(block.command, cwd, timeout=300)  # 5 minute timeout
 
-        if result.returncode == 0:
+        if returncode == 0:
             return CommandResult(command=block.command, status="OK")
         else:
-            # Combine stdout and stderr for error output
-            output = result.stdout + result.stderr
-            return CommandResult(command=block.command, status="FAIL", output=output.strip())
+            return CommandResult(
+                command=block.command, status="FAIL", output=truncate_output(output.strip())
+            )
 
     except subprocess.TimeoutExpired:
         return CommandResult(
@@ -173,47 +211,43 @@ def _execute_command(block: CommandBlock, workspace: Path | None, dry_run: bool)
 
 def format_applied_block(result: ApplyResult) -> str:
     """Format apply results as markdown block."""
-    lines: list[str] = []
+    buf = io.StringIO()
+    w = buf.write
 
     # Opening marker with status
     if result.status == "PARTIAL":
-        lines.append("<!-- ask:applied status=PARTIAL -->")
+        w("<!-- ask:applied status=PARTIAL -->\n")
     else:
-        lines.append("<!-- ask:applied -->")
+        w("<!-- ask:applied -->\n")
 
     # File results table
     if result.file_results:
-        lines.append("| Path | Action | Size |")
-        lines.append("|------|--------|------|")
+        w("| Path | Action | Size |\n|------|--------|------|\n")
         for fr in result.file_results:
             size_str = _format_size(fr.size) if fr.error is None else fr.error or "error"
-            lines.append(f"| {fr.path} | {fr.action} | {size_str} |")
+            w(f"| {fr.path} | {fr.action} | {size_str} |\n")
 
     # Command results table
     if result.command_results:
         if result.file_results:
-            lines.append("")  # Blank line between tables
-        lines.append("| Command | Status |")
-        lines.append("|---------|--------|")
+            w("\n")  # Blank line between tables
+        w("| Command | Status |\n|---------|--------|\n")
         for cr in result.command_results:
             # Truncate long commands for table
             cmd_display = cr.command if len(cr.command) <= 40 else cr.command[:37] + "..."
-            lines.append(f"| {cmd_display} | {cr.status} |")
+            w(f"| {cmd_display} | {cr.status} |\n")
 
     # Failed command output
-    failed_commands = [cr for cr in result.command_results if cr.status == "FAIL" and cr.output]
-    for cr in failed_commands:
-        lines.append("")
+    for cr in result.command_results:
+        if cr.status != "FAIL" or not cr.output:
+            continue
         # Truncate command for heading
         cmd_display = cr.command if len(cr.command) <= 50 else cr.command[:47] + "..."
-        lines.append(f"### {cmd_display}")
-        lines.append("```")
-        lines.append(cr.output or "")
-        lines.append("```")
+        w(f"\n### {cmd_display}\n```\n{cr.output}\n```\n")
 
-    lines.append("<!-- /ask:applied -->")
+    w("<!-- /ask:applied -->")
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
 def _format_size(size: int) -> str:
@@ -231,36 +265,46 @@ def insert_applied_block(session_path: str, applied_block: str) -> None:
 
     Inserts after the turn header, before any user text.
     """
-    content = Path(session_path).read_text(encoding="utf-8")
-
-    # Find the input marker
-    marker_info = find_input_marker(content)
-    if marker_info is None:
-        raise AskError(
-            "No input marker found",
-            "Add `_` on its own line in the current human turn",
-        )
-
-    line_idx, _ = marker_info
-    lines = content.split("\n")
-
-    # Find the start of the current human turn (search backwards from marker)
-    turn_start = None
-    for i in range(line_idx - 1, -1, -1):
-        if lines[i].startswith("# [") and "Human" in lines[i]:
-            turn_start = i
-            break
+    with SessionEditor(session_path) as editor:
+        editor.insert_block(applied_block)
 
-    if turn_start is None:
-        raise AskError("Cannot find human turn for marker")
 
-    # Insert position is right after turn header (and any blank line)
-    insert_pos = turn_start + 1
-    while insert_pos < line_idx and lines[insert_pos].strip() == "":
-        insert_pos += 1
+def print_apply_result(result: ApplyResult, dry_run: bool = False) -> None:
+    """Print apply results to console."""
+    if result.file_results:
+        output.blank()
+        for fr in result.file_results:
+            if fr.error:
+                output.error(f"{fr.path} - {fr.error}")
+            else:
+                action_color = output.green if fr.action == "created" else output.cyan
+                output.success(
+                    f"{fr.path} {output.dim('·')} "
+                    f"{action_color(fr.action)} {output.dim(f'({fr.size}B)')}"
+                )
 
-    # Insert the applied block
-    new_lines = lines[:insert_pos] + ["", applied_block, ""] + lines[insert_pos:]
+    if result.command_results:
+        output.blank()
+        for cr in result.command_results:
+            report = output.success if cr.status == "OK" else output.error
+            report(f"{output.dim('$')} {cr.command}")
+            if cr.status != "OK" and cr.output:
+                lines = cr.output.split("\n", 5)[:5]
+                output.info("\n".join(f"  {output.dim(line)}" for line in lines))
+
+    output.blank()
+    file_count = len(result.file_results)
+    cmd_count = len(result.command_results)
+
+    parts: list[str] = []
+    if file_count:
+        parts.append(f"{file_count} file{'s' if file_count != 1 else ''}")
+    if cmd_count:
+        parts.append(f"{cmd_count} command{'s' if cmd_count != 1 else ''}")
 
-    # Write back
-    Path(session_path).write_text("\n".join(new_lines), encoding="utf-8")
+    if dry_run:
+        output.info(f"Would apply: {', '.join(parts)}")
+    elif result.status == "OK":
+        output.success(f"Applied {', '.join(parts)}")
+    else:
+        output.warning("Apply completed with errors")
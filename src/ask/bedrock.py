@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import re
+import time
 from collections.abc import Iterator
-from typing import Any, cast
+from typing import Any, NamedTuple, cast
 
 import boto3
 from botocore.config import Config as BotoConfig
@@ -12,6 +13,7 @@ from botocore.config import Config as BotoConfig
 from ask.config import load_config
 from ask.errors import AskError
 from ask.types import (
+    Config,
     InferenceProfile,
     Message,
     ModelType,
@@ -22,6 +24,30 @@ from ask.types import (
 
 TIMEOUT_SECONDS = 300  # 5 minutes
 
+# Streamed text is yielded once this many characters or seconds accumulate
+STREAM_FLUSH_CHARS = 4096
+STREAM_FLUSH_SECONDS = 0.02
+
+ARN_REGION_PATTERN = re.compile(r"arn:aws:bedrock:([^:]+):")
+MODEL_DATE_PATTERN = re.compile(r"(\d{8})")
+
+
+class ModelVersion(NamedTuple):
+    """Version info parsed from a model ID."""
+
+    major: int
+    minor: int
+    date: str
+
+
+class ProfileMatch(NamedTuple):
+    """An inference profile whose model matches the requested type."""
+
+    arn: str
+    model_id: str
+    version: ModelVersion
+    region: str
+
 
 def _get_boto3_client(service: str, region: str | None = None) -> Any:
     """
@@ -47,41 +73,25 @@ def _get_boto3_client(service: str, region: str | None = None) -> Any:
     )
 
 
-def find_profile(model_type: ModelType) -> InferenceProfile:
-    """Find an inference profile for the given model type."""
-    config = load_config()
+def find_profile(model_type: ModelType, config: Config | None = None) -> InferenceProfile:
+    """Find an inference profile for the given model type.
+
+    Args:
+        model_type: Model family to look for
+        config: Configuration (loads default if None)
+    """
+    if config is None:
+        config = load_config()
     region = config.region or "us-west-2"
 
     client = _get_boto3_client("bedrock", region)
 
-    # List inference profiles
-    all_profiles: list[dict[str, Any]] = []
-    next_token: str | None = None
-
-    while True:
-        kwargs: dict[str, Any] = {"maxResults": 100}
-        if next_token:
-            kwargs["nextToken"] = next_token
-
-        response = cast(dict[str, Any], client.list_inference_profiles(**kwargs))
-
-        profiles = cast(list[dict[str, Any]], response.get("inferenceProfileSummaries", []))
-        all_profiles.extend(profiles)
-
-        next_token = cast(str | None, response.get("nextToken"))
-        if not next_token:
-            break
-
-    if not all_profiles:
-        raise AskError(
-            "No inference profiles found",
-            "Check your AWS account has cross-region inference enabled",
-        )
-
-    # Find matching profiles
-    matches: list[dict[str, Any]] = []
+    # Match profiles page by page instead of collecting every profile first
+    found_any = False
+    matches: list[ProfileMatch] = []
 
-    for profile in all_profiles:
+    for profile in _iter_inference_profiles(client):
+        found_any = True
         arn = cast(str, profile.get("inferenceProfileArn", ""))
         models = cast(list[dict[str, Any]], profile.get("models", []))
 
@@ -96,41 +106,52 @@ def find_profile(model_type: ModelType) -> InferenceProfile:
             version = _parse_model_version(model_id)
 
             matches.append(
-                {
-                    "arn": arn,
-                    "model_id": model_id,
-                    "version": version,
-                    "region": arn_region,
-                }
+                ProfileMatch(arn=arn, model_id=model_id, version=version, region=arn_region)
             )
 
+    if not found_any:
+        raise AskError(
+            "No inference profiles found",
+            "Check your AWS account has cross-region inference enabled",
+        )
+
     if not matches:
         raise AskError(
             f"No inference profile found for {model_type} models",
             "Check AWS Bedrock console for available models",
         )
 
-    # Sort by preferred region, then version (descending), then date (descending)
+    # Pick by preferred region, then version (descending), then date (descending)
     preferred_region = config.region
 
-    def sort_key(m: dict[str, Any]) -> tuple[int, int, int, str]:
-        region_priority = 0 if m["region"] == preferred_region else 1
-        v = cast(dict[str, Any], m["version"])
+    def sort_key(m: ProfileMatch) -> tuple[int, int, int, str]:
         # Negate major/minor for descending sort, negate date by reversing string
         return (
-            region_priority,
-            -cast(int, v["major"]),
-            -cast(int, v["minor"]),
-            _negate_date(cast(str, v["date"])),
+            0 if m.region == preferred_region else 1,
+            -m.version.major,
+            -m.version.minor,
+            _negate_date(m.version.date),
         )
 
-    matches.sort(key=sort_key)
+    selected = min(matches, key=sort_key)
+    return InferenceProfile(arn=selected.arn, model_id=selected.model_id)
 
-    selected = matches[0]
-    return InferenceProfile(
-        arn=cast(str, selected["arn"]),
-        model_id=cast(str, selected["model_id"]),
-    )
+
+def _iter_inference_profiles(client: Any) -> Iterator[dict[str, Any]]:
+    """Yield inference profile summaries, fetching pages lazily."""
+    next_token: str | None = None
+
+    while True:
+        kwargs: dict[str, Any] = {"maxResults": 100}
+        if next_token:
+            kwargs["nextToken"] = next_token
+
+        response = cast(dict[str, Any], client.list_inference_profiles(**kwargs))
+        yield from cast(list[dict[str, Any]], response.get("inferenceProfileSummaries", []))
+
+        next_token = cast(str | None, response.get("nextToken"))
+        if not next_token:
+            return
 
 
 def _negate_date(date: str) -> str:
@@ -144,11 +165,11 @@ def _negate_date(date: str) -> str:
 
 def _extract_region_from_arn(arn: str) -> str:
     """Extract AWS region from an ARN."""
-    match = re.search(r"arn:aws:bedrock:([^:]+):", arn)
+    match = ARN_REGION_PATTERN.search(arn)
     return match.group(1) if match else "unknown"
 
 
-def _parse_model_version(model_id: str) -> dict[str, Any]:
+def _parse_model_version(model_id: str) -> ModelVersion:
     """Parse version info from a model ID.
 
     Model IDs look like:
@@ -156,10 +177,10 @@ def _parse_model_version(model_id: str) -> dict[str, Any]:
     - anthropic.claude-opus-4-20250514-v1:0
     - anthropic.claude-3-opus-20240229-v1:0
 
-    Returns dict with major, minor, and date.
+    Returns ModelVersion with major, minor, and date.
     """
     # Extract 8-digit date
-    date_match = re.search(r"(\d{8})", model_id)
+    date_match = MODEL_DATE_PATTERN.search(model_id)
     date = date_match.group(1) if date_match else "00000000"
 
     parts = model_id.split("-")
@@ -175,7 +196,7 @@ def _parse_model_version(model_id: str) -> dict[str, Any]:
     major = version_parts[0] if version_parts else 3
     minor = version_parts[1] if len(version_parts) > 1 else 0
 
-    return {"major": major, "minor": minor, "date": date}
+    return ModelVersion(major=major, minor=minor, date=date)
 
 
 def stream_completion(
@@ -183,9 +204,19 @@ def stream_completion(
     messages: list[Message],
     max_tokens: int,
     temperature: float = 1.0,
+    config: Config | None = None,
 ) -> Iterator[StreamEvent]:
-    """Stream a completion from Bedrock."""
-    config = load_config()
+    """Stream a completion from Bedrock.
+
+    Args:
+        profile_arn: Inference profile to invoke
+        messages: Conversation so far
+        max_tokens: Output token limit (capped at 64000)
+        temperature: Sampling temperature
+        config: Configuration (loads default if None)
+    """
+    if config is None:
+        config = load_config()
     region = config.region or "us-west-2"
 
     client = _get_boto3_client("bedrock-runtime", region)
@@ -203,6 +234,12 @@ def stream_completion(
         )
 
         total_tokens = 0
+        total_chars = 0
+
+        # Coalesce small deltas into fewer chunks, flushing by size or age
+        pending: list[str] = []
+        pending_len = 0
+        last_flush = time.monotonic()
 
         stream = cast(list[dict[str, Any]], response.get("stream", []))
 
@@ -211,9 +248,21 @@ def stream_completion(
                 delta = cast(dict[str, Any], event["contentBlockDelta"].get("delta", {}))
                 text = cast(str, delta.get("text", ""))
                 if text:
-                    tokens = len(text) // 4 + 1
-                    total_tokens += tokens
-                    yield StreamChunk(text=text, tokens=total_tokens)
+                    # Estimate from the running character count (~4 chars per token)
+                    total_chars += len(text)
+                    total_tokens = (total_chars + 3) // 4
+                    pending.append(text)
+                    pending_len += len(text)
+
+                    now = time.monotonic()
+                    if (
+                        pending_len >= STREAM_FLUSH_CHARS
+                        or now - last_flush >= STREAM_FLUSH_SECONDS
+                    ):
+                        yield StreamChunk(text="".join(pending), tokens=total_tokens)
+                        pending.clear()
+                        pending_len = 0
+                        last_flush = now
 
             if "metadata" in event:
                 metadata = cast(dict[str, Any], event["metadata"])
@@ -221,6 +270,9 @@ def stream_completion(
                 if "outputTokens" in usage:
                     total_tokens = cast(int, usage["outputTokens"])
 
+        if pending:
+            yield StreamChunk(text="".join(pending), tokens=total_tokens)
+
         yield StreamEnd(total_tokens=total_tokens)
 
     except Exception as e:
@@ -0,0 +1,121 @@
+"""Stream AI responses into session files."""
+
+from __future__ import annotations
+
+import signal
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from ask.bedrock import extract_region, find_profile, stream_completion
+from ask.config import load_config
+from ask.output import output
+from ask.session import SessionWriter, read_session, turns_to_messages, validate_session
+from ask.tokens import estimate_tokens
+from ask.types import ModelType, StreamChunk, StreamEnd
+
+# Redraw the token counter at most ~20 times a second
+PROGRESS_INTERVAL_SECONDS = 0.05
+
+
+def chat_session(session_path: str, model: ModelType | None = None) -> None:
+    """Send the session to Bedrock and append the streamed response.
+
+    Args:
+        session_path: Path to session file
+        model: Model override; defaults to the configured model
+    """
+    config = load_config()
+    model_type = model or config.model
+
+    sess = read_session(session_path)
+    validate_session(sess)
+
+    profile = find_profile(model_type, config)
+    region = extract_region(profile)
+
+    output.meta([("Model", f"{output.model_name(profile.model_id)} {output.dim(f'({region})')}")])
+
+    messages = turns_to_messages(sess.turns)
+    input_tokens = estimate_tokens(messages)
+    turn_label = "turn" if len(sess.turns) == 1 else "turns"
+
+    output.meta(
+        [
+            ("Input", f"{output.number(input_tokens)} tokens"),
+            ("Turns", f"{len(sess.turns)} {turn_label}"),
+        ]
+    )
+
+    if input_tokens > 150000:
+        output.blank()
+        output.warning("Large input may be slow or hit limits")
+
+    next_turn_number = sess.turns[-1].number + 1
+    writer = SessionWriter(session_path, next_turn_number)
+
+    final_tokens = 0
+    interrupted = False
+    last_progress = 0.0
+
+    output.blank()
+    output.write(output.dim("Streaming... "))
+
+    progress_prefix = f"{output.dim('Streaming')} "
+    progress_suffix = f" {output.dim('tokens')}"
+
+    max_tokens = config.max_tokens or 32000
+    with _sigint_event() as interrupt:
+        for event in stream_completion(
+            profile.arn,
+            messages,
+            max_tokens,
+            config.temperature,
+            config=config,
+        ):
+            if interrupt.is_set():
+                interrupted = True
+                break
+
+            if isinstance(event, StreamChunk):
+                writer.write(event.text)
+                final_tokens = event.tokens
+                now = time.monotonic()
+                if now - last_progress < PROGRESS_INTERVAL_SECONDS:
+                    continue
+                last_progress = now
+                output.progress(
+                    f"{progress_prefix}{output.cyan(output.number(final_tokens))}{progress_suffix}"
+                )
+            elif isinstance(event, StreamEnd):
+                final_tokens = event.total_tokens
+
+    writer.end(interrupted)
+
+    output.clear_line()
+    if interrupted:
+        output.warning(f"Interrupted at {output.cyan(output.number(final_tokens))} tokens")
+    else:
+        output.success(f"Done {output.dim('·')} {output.cyan(output.number(final_tokens))} tokens")
+
+
+@contextmanager
+def _sigint_event() -> Iterator[threading.Event]:
+    """Turn SIGINT into a flag for the duration of the block.
+
+    The previous handler is restored on exit. Handlers can only be installed
+    from the main thread; elsewhere Ctrl-C stays a KeyboardInterrupt for the
+    caller to deal with.
+    """
+    interrupt = threading.Event()
+    if threading.current_thread() is not threading.main_thread():
+        yield interrupt
+        return
+
+    previous_handler = signal.signal(signal.SIGINT, lambda signum, frame: interrupt.set())
+    try:
+        yield interrupt
+    finally:
+        # None means the old handler was not set from Python
+        signal.signal(signal.SIGINT, previous_handler or signal.SIG_DFL)
@@ -2,24 +2,47 @@
 
 from __future__ import annotations
 
+import io
 import json
+import os
 import re
+import signal
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, cast
 
 from ask.errors import AskError
-from ask.parser import find_input_marker
-from ask.session import read_session
+from ask.output import output
+from ask.session import SessionEditor, parse_session
 from ask.workspace import find_workspace
 
 CHECK_TIMEOUT_SECONDS = 60
 
+# Failure output longer than this keeps only its head and tail
+MAX_OUTPUT_CHARS = 65536
 
-@dataclass
+ANSI_PATTERN = re.compile(r"\x1b\[[0-9;]*[a-zA-Z]")
+PYTEST_COUNT_PATTERN = re.compile(r"(\d+)\s+(passed|failed)")
+PYRIGHT_ERROR_PATTERN = re.compile(r"(\d+)\s+error")
+RUFF_ISSUE_PATTERN = re.compile(r"^\S+:\d+:\d+:", re.MULTILINE)
+
+# Processes started by run_shell that are still running, so an interrupted
+# check run can kill the ones its worker threads are waiting on
+_running_processes: set[subprocess.Popen[str]] = set()
+_running_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
 class CheckDef:
-    """Definition of a single check."""
+    """Definition of a single check.
+
+    Frozen because load_checks hands out the same cached instances to every
+    caller.
+    """
 
     id: str
     name: str
@@ -54,13 +77,21 @@ def get_checks_path() -> Path:
 def load_checks() -> list[CheckDef]:
     """Load check definitions from config.
 
-    Auto-creates default config if not exists.
+    Auto-creates default config if not exists. Parsed results are cached
+    by path, mtime and size until the file changes.
     """
     checks_path = get_checks_path()
 
     if not checks_path.exists():
         _create_default_checks_config(checks_path)
 
+    stat = checks_path.stat()
+    return list(_load_checks_cached(checks_path, stat.st_mtime_ns, stat.st_size))
+
+
+@lru_cache(maxsize=1)
+def _load_checks_cached(checks_path: Path, mtime_ns: int, size: int) -> tuple[CheckDef, ...]:
+    """Read and parse checks.json (cached per file version)."""
     try:
         text = checks_path.read_text(encoding="utf-8")
         data: dict[str, Any] = json.loads(text)
@@ -88,7 +119,7 @@ def load_checks() -> list[CheckDef]:
                 )
             )
 
-        return checks
+        return tuple(checks)
 
     except json.JSONDecodeError as e:
         raise AskError(f"Invalid checks.json: {e}") from e
@@ -153,17 +184,25 @@ def run_checks(session_path: str, fix: bool = False) -> CheckRunResult:
 
     checks = load_checks()
 
-    # Run fix commands first if requested
+    # Run fix commands first if requested (sequentially, since they edit the same files)
     if fix:
         for check in checks:
             if check.fix_command:
                 _run_command(check.fix_command, cwd)
 
-    # Run all check commands
+    # Run all check commands concurrently; each runs in its own subprocess
     results: list[CheckResult] = []
-    for check in checks:
-        result = _execute_check(check, cwd)
-        results.append(result)
+    if checks:
+        executor = ThreadPoolExecutor(max_workers=len(checks))
+        try:
+            futures = [executor.submit(_execute_check, check, cwd) for check in checks]
+            results = [future.result() for future in futures]
+        except BaseException:
+            # On Ctrl-C don't wait out the running checks; kill them instead
+            executor.shutdown(wait=False, cancel_futures=True)
+            _kill_running_processes()
+            raise
+        executor.shutdown()
 
     # Determine overall status
     has_failure = any(r.status != "PASS" for r in results)
@@ -175,19 +214,11 @@ def run_checks(session_path: str, fix: bool = False) -> CheckRunResult:
 def _execute_check(check: CheckDef, cwd: Path) -> CheckResult:
     """Execute a single check and return result."""
     try:
-        result = subprocess.run(
-            check.command,
-            shell=True,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=CHECK_TIMEOUT_SECONDS,
-        )
+        returncode, raw_output = run_shell(check.command, cwd, CHECK_TIMEOUT_SECONDS)
 
-        output = result.stdout + result.stderr
-        output = strip_ansi_codes(output).strip()
+        output = strip_ansi_codes(raw_output).strip()
 
-        if result.returncode == 0:
+        if returncode == 0:
             summary = extract_summary(check.id, output, passed=True)
             return CheckResult(
                 id=check.id,
@@ -203,7 +234,7 @@ def _execute_check(check: CheckDef, cwd: Path) -> CheckResult:
                 name=check.name,
                 status="FAIL",
                 summary=summary,
-                output=output if output else None,
+                output=truncate_output(output) if output else None,
             )
 
     except subprocess.TimeoutExpired:
@@ -233,45 +264,116 @@ def _execute_check(check: CheckDef, cwd: Path) -> CheckResult:
 
 
 def _run_command(command: str, cwd: Path) -> None:
-    """Run a command without capturing output (for fix commands)."""
+    """Run a command, discarding its output (for fix commands)."""
     try:  # noqa: SIM105
-        subprocess.run(
-            command,
-            shell=True,
-            cwd=cwd,
-            timeout=CHECK_TIMEOUT_SECONDS,
-            capture_output=True,
-        )
+        run_shell(command, cwd, CHECK_TIMEOUT_SECONDS)
     except Exception:
         # Fix commands are best-effort, don't fail on errors
         pass
 
 
+def run_shell(
+    command: str,
+    cwd: Path,
+    timeout: float,
+) -> tuple[int, str]:
+    """Run a shell command and return (returncode, output).
+
+    Stderr is merged into stdout at the pipe, so output is read once.
+    The command runs in its own process group, so a terminal Ctrl-C does not
+    reach it directly. On timeout or any interruption (KeyboardInterrupt
+    included) the whole group is killed so children of the shell cannot
+    linger, then the exception is re-raised.
+    """
+    with subprocess.Popen(
+        command,
+        shell=True,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        start_new_session=True,
+    ) as process:
+        with _running_lock:
+            _running_processes.add(process)
+        try:
+            output, _ = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            _kill_process_group(process)
+            process.communicate()
+            raise
+        except BaseException:
+            _kill_process_group(process)
+            raise
+        finally:
+            with _running_lock:
+                _running_processes.discard(process)
+
+    return process.returncode, output
+
+
+def _kill_running_processes() -> None:
+    """Kill the process groups of all commands still running."""
+    with _running_lock:
+        processes = list(_running_processes)
+    for process in processes:
+        _kill_process_group(process)
+
+
+def _kill_process_group(process: subprocess.Popen[str]) -> None:
+    """Kill a process and everything in its process group."""
+    if not hasattr(os, "killpg"):
+        # No process groups on Windows
+        process.kill()
+        return
+    try:  # noqa: SIM105
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        # Group already exited
+        pass
+
+
+def truncate_output(output: str) -> str:
+    """Cap command output at MAX_OUTPUT_CHARS, keeping its head and tail.
+
+    The middle is replaced by a note saying how many characters were dropped.
+    """
+    if len(output) <= MAX_OUTPUT_CHARS:
+        return output
+    half = MAX_OUTPUT_CHARS // 2
+    dropped = len(output) - 2 * half
+    return f"{output[:half]}\n... [truncated {dropped} characters] ...\n{output[-half:]}"
+
+
 def strip_ansi_codes(text: str) -> str:
     """Strip ANSI escape codes from text."""
-    ansi_pattern = re.compile(r"\x1b\[[0-9;]*[a-zA-Z]")
-    return ansi_pattern.sub("", text)
+    if "\x1b" not in text:
+        return text
+    return ANSI_PATTERN.sub("", text)
 
 
 def extract_summary(check_id: str, output: str, passed: bool) -> str:
     """Extract a summary from check output."""
     try:
         if check_id == "pytest":
-            # Look for "X passed" or "X failed"
-            passed_match = re.search(r"(\d+)\s+passed", output)
-            failed_match = re.search(r"(\d+)\s+failed", output)
+            # Look for the first "X passed" and "X failed" in a single scan
+            counts: dict[str, str] = {}
+            for match in PYTEST_COUNT_PATTERN.finditer(output):
+                counts.setdefault(match.group(2), match.group(1))
+                if len(counts) == 2:
+                    break
 
             parts: list[str] = []
-            if passed_match:
-                parts.append(f"{passed_match.group(1)} passed")
-            if failed_match:
-                parts.append(f"{failed_match.group(1)} failed")
+            if "passed" in counts:
+                parts.append(f"{counts['passed']} passed")
+            if "failed" in counts:
+                parts.append(f"{counts['failed']} failed")
 
             return ", ".join(parts) if parts else ""
 
         elif check_id == "pyright":
             # Look for "X errors" or "0 errors"
-            error_match = re.search(r"(\d+)\s+error", output)
+            error_match = PYRIGHT_ERROR_PATTERN.search(output)
             if error_match:
                 count = int(error_match.group(1))
                 if count > 0:
@@ -281,9 +383,8 @@ def extract_summary(check_id: str, output: str, passed: bool) -> str:
         elif check_id == "ruff":
             if not passed:
                 # Count number of issues (lines that look like file:line:col)
-                issues = re.findall(r"^\S+:\d+:\d+:", output, re.MULTILINE)
-                if issues:
-                    count = len(issues)
+                count = sum(1 for _ in RUFF_ISSUE_PATTERN.finditer(output))
+                if count:
                     return f"{count} errors" if count > 1 else "1 error"
             return ""
 
@@ -299,107 +400,81 @@ def extract_summary(check_id: str, output: str, passed: bool) -> str:
 
 def format_check_block(result: CheckRunResult) -> str:
     """Format check results as markdown block."""
-    lines: list[str] = []
+    buf = io.StringIO()
+    w = buf.write
 
-    # Opening marker with status
-    lines.append(f"<!-- ask:check status={result.status} -->")
-
-    # Summary table
-    lines.append("| Check | Status | Summary |")
-    lines.append("|-------|--------|---------|")
+    # Opening marker with status, then summary table
+    w(f"<!-- ask:check status={result.status} -->\n")
+    w("| Check | Status | Summary |\n|-------|--------|---------|\n")
 
     for r in result.results:
-        summary = r.summary if r.summary else ""
-        lines.append(f"| {r.id} | {r.status} | {summary} |")
+        w(f"| {r.id} | {r.status} | {r.summary} |\n")
 
     # Detail sections for failed checks
-    failed_checks = [r for r in result.results if r.status != "PASS" and r.output]
-    for r in failed_checks:
-        lines.append("")
-        lines.append(f"### {r.id}")
-        lines.append("```")
-        lines.append(r.output or "")
-        lines.append("```")
+    for r in result.results:
+        if r.status == "PASS" or not r.output:
+            continue
+        w(f"\n### {r.id}\n```\n{r.output}\n```\n")
 
-    lines.append("<!-- /ask:check -->")
+    w("<!-- /ask:check -->")
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
 def insert_check_block(session_path: str, check_block: str) -> None:
     """Insert check block before the _ marker in session.
 
-    Inserts after the turn header, before any user text.
+    Inserts after the turn header and any existing machine blocks,
+    before any user text.
     """
-    content = Path(session_path).read_text(encoding="utf-8")
+    with SessionEditor(session_path) as editor:
+        editor.insert_block(check_block, after_machine_blocks=True)
 
-    marker_info = find_input_marker(content)
-    if marker_info is None:
-        raise AskError(
-            "No input marker found",
-            "Add `_` on its own line in the current human turn",
-        )
-
-    line_idx, _ = marker_info
-    lines = content.split("\n")
-
-    # Find the start of the current human turn
-    turn_start = None
-    for i in range(line_idx - 1, -1, -1):
-        if lines[i].startswith("# [") and "Human" in lines[i]:
-            turn_start = i
-            break
-
-    if turn_start is None:
-        raise AskError("Cannot find human turn for marker")
-
-    # Find insertion point: after turn header, after any existing machine blocks
-    insert_pos = turn_start + 1
-
-    # Skip blank lines after turn header
-    while insert_pos < line_idx and lines[insert_pos].strip() == "":
-        insert_pos += 1
-
-    # Skip existing machine blocks (ask:applied, ask:check)
-    while insert_pos < line_idx:
-        line = lines[insert_pos].strip()
-        if line.startswith("<!-- ask:applied") or line.startswith("<!-- ask:check"):
-            # Find the closing marker
-            while insert_pos < line_idx:
-                if lines[insert_pos].strip() in ("<!-- /ask:applied -->", "<!-- /ask:check -->"):
-                    insert_pos += 1
-                    break
-                insert_pos += 1
-            # Skip blank lines after block
-            while insert_pos < line_idx and lines[insert_pos].strip() == "":
-                insert_pos += 1
-        else:
-            break
 
-    # Insert the block
-    new_lines = lines[:insert_pos] + ["", check_block, ""] + lines[insert_pos:]
-
-    Path(session_path).write_text("\n".join(new_lines), encoding="utf-8")
-
-
-def check_session(session_path: str, fix: bool = False) -> CheckRunResult:
+def check_session(
+    session_path: str,
+    fix: bool = False,
+    editor: SessionEditor | None = None,
+) -> CheckRunResult:
     """Run checks and insert results into session.
 
     Args:
         session_path: Path to session file
         fix: If True, run fix_commands before commands
+        editor: Open editor to insert results into (writes file directly if None)
 
     Returns:
         CheckRunResult with all check results
     """
-    # Validate session exists and has proper structure
-    _ = read_session(session_path)
+    if editor is None:
+        with SessionEditor(session_path) as session_editor:
+            return check_session(session_path, fix=fix, editor=session_editor)
+
+    # Validate session has proper structure
+    _ = parse_session(editor.content)
 
     # Run checks
     result = run_checks(session_path, fix=fix)
 
     # Format and insert block
-    check_block = format_check_block(result)
-    insert_check_block(session_path, check_block)
+    editor.insert_block(format_check_block(result), after_machine_blocks=True)
 
     return result
+
+
+def print_check_result(result: CheckRunResult) -> None:
+    """Print check results to console."""
+    reporters = {"PASS": output.success, "FAIL": output.error, "TIMEOUT": output.warning}
+
+    output.blank()
+    for r in result.results:
+        summary = "timeout" if r.status == "TIMEOUT" else r.summary
+        report = reporters.get(r.status, output.error)
+        report(f"{r.id} {output.dim(f'({summary})')}" if summary else r.id)
+
+    output.blank()
+    if result.status == "PASS":
+        output.success("All checks passed")
+    else:
+        fail_count = sum(1 for r in result.results if r.status != "PASS")
+        output.error(f"{fail_count} check{'s' if fail_count != 1 else ''} failed")
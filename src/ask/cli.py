@@ -2,39 +2,64 @@
 
 from __future__ import annotations
 
-import signal
+import functools
+import sys
+from collections.abc import Callable
 from pathlib import Path
 from typing import Annotated
 
 import typer
 
-from ask.apply import apply_session, format_applied_block, insert_applied_block
-from ask.bedrock import extract_region, find_profile, stream_completion
-from ask.check import check_session
-from ask.config import ensure_config, get_config_path, load_config, save_config, update_config
-from ask.errors import AskError, ConfigError
+from ask.errors import AskError
 from ask.output import output
-from ask.refresh import print_refresh_result, refresh_session
-from ask.session import (
-    SessionWriter,
-    expand_session,
-    read_session,
-    turns_to_messages,
-    validate_session,
-)
-from ask.tokens import estimate_tokens
-from ask.types import Config, ModelType, StreamChunk, StreamEnd
+from ask.types import ModelType
 from ask.version import get_version_string
-from ask.workspace import find_workspace
+
+# Command modules (boto3, httpx, readability, ...) are imported inside each
+# command so that --help, --version and typos don't pay for them.
 
 app = typer.Typer(
     name="ask",
     help="AI conversations through Markdown files",
     add_completion=False,
     no_args_is_help=False,
+    rich_markup_mode=None,
+    pretty_exceptions_enable=False,
 )
 
 
+def _require_session(session: Path) -> None:
+    """Exit with a helpful message if the session file does not exist."""
+    if session.is_file():
+        return
+    if session.name == "session.md":
+        output.error("No session.md found")
+        output.info("Run 'ask init' to create session.md")
+    else:
+        output.error(f"File not found: {session}")
+    raise typer.Exit(1)
+
+
+def _handle_errors(command: Callable[..., None]) -> Callable[..., None]:
+    """Report errors raised by a command and exit with status 1."""
+
+    @functools.wraps(command)
+    def wrapper(*args: object, **kwargs: object) -> None:
+        try:
+            command(*args, **kwargs)
+        except typer.Exit:
+            raise
+        except Exception as e:
+            ask_error = e if isinstance(e, AskError) else AskError.from_exception(e)
+            output.error(ask_error.message)
+            if ask_error.help_text:
+                output.blank()
+                output.info(ask_error.help_text)
+            raise typer.Exit(1) from None
+
+    return wrapper
+
+
 def version_callback(value: bool) -> None:
     """Show version and exit."""
     if value:
@@ -62,6 +87,7 @@ def main_callback(
 
 
 @app.command()
+@_handle_errors
 def chat(
     session: Annotated[
         Path,
@@ -73,102 +99,11 @@ def chat(
     ] = None,
 ) -> None:
     """Continue the conversation with AI."""
-    if not session.exists():
-        if session.name == "session.md":
-            output.error("No session.md found")
-            output.info("Run 'ask init' to create session.md")
-        else:
-            output.error(f"File not found: {session}")
-        raise typer.Exit(1)
-
-    try:
-        config = load_config()
-        model_type = model or config.model
+    from ask.chat import chat_session
 
-        sess = read_session(str(session))
-        validate_session(sess)
+    _require_session(session)
 
-        profile = find_profile(model_type)
-        region = extract_region(profile)
-
-        output.meta(
-            [("Model", f"{output.model_name(profile.model_id)} {output.dim(f'({region})')}")]
-        )
-
-        messages = turns_to_messages(sess.turns)
-        input_tokens = estimate_tokens(messages)
-        turn_label = "turn" if len(sess.turns) == 1 else "turns"
-
-        output.meta(
-            [
-                ("Input", f"{output.number(input_tokens)} tokens"),
-                ("Turns", f"{len(sess.turns)} {turn_label}"),
-            ]
-        )
-
-        if input_tokens > 150000:
-            output.blank()
-            output.warning("Large input may be slow or hit limits")
-
-        next_turn_number = sess.turns[-1].number + 1
-        writer = SessionWriter(str(session), next_turn_number)
-
-        final_tokens = 0
-        interrupted = False
-
-        def handle_interrupt(signum: int, frame: object) -> None:
-            nonlocal interrupted
-            interrupted = True
-
-        signal.signal(signal.SIGINT, handle_interrupt)
-
-        output.blank()
-        output.write(output.dim("Streaming... "))
-
-        max_tokens = config.max_tokens or 32000
-        for event in stream_completion(
-            profile.arn,
-            messages,
-            max_tokens,
-            config.temperature,
-        ):
-            if interrupted:
-                break
-
-            if isinstance(event, StreamChunk):
-                writer.write(event.text)
-                final_tokens = event.tokens
-                output.progress(
-                    f"{output.dim('Streaming')} "
-                    f"{output.cyan(output.number(final_tokens))} "
-                    f"{output.dim('tokens')}"
-                )
-            elif isinstance(event, StreamEnd):
-                final_tokens = event.total_tokens
-
-        writer.end(interrupted)
-
-        output.clear_line()
-        if interrupted:
-            output.warning(f"Interrupted at {output.cyan(output.number(final_tokens))} tokens")
-        else:
-            output.success(
-                f"Done {output.dim('·')} {output.cyan(output.number(final_tokens))} tokens"
-            )
-
-    except AskError as e:
-        output.error(e.message)
-        if e.help_text:
-            output.blank()
-            output.info(e.help_text)
-        raise typer.Exit(1) from None
-    except Exception as e:
-        ask_error = AskError.from_exception(e)
-        output.error(ask_error.message)
-        if ask_error.help_text:
-            output.blank()
-            output.info(ask_error.help_text)
-        raise typer.Exit(1) from None
+    chat_session(str(session), model)
 
 
 @app.command()
@@ -179,23 +114,22 @@ def init(
     ] = Path("session.md"),
 ) -> None:
     """Initialize a new session file."""
-    file_path = path
+    from ask.config import ensure_config
 
-    if str(path).endswith("/") or str(path).endswith("\\"):
+    file_path = path
+    if str(path).endswith(("/", "\\")) or path.is_dir():
         file_path = path / "session.md"
 
-    if file_path.exists() and file_path.is_dir():
-        file_path = file_path / "session.md"
+    file_path.parent.mkdir(parents=True, exist_ok=True)
 
-    if file_path.exists():
+    # Exclusive create: the existence check and the write are one step
+    try:
+        with file_path.open("x", encoding="utf-8") as f:
+            f.write("# [1] Human\n\n_\n")
+    except FileExistsError:
         output.error(f"{file_path} already exists")
         output.info("Delete it to start fresh")
-        raise typer.Exit(1)
-
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-
-    content = "# [1] Human\n\n_\n"
-    file_path.write_text(content, encoding="utf-8")
+        raise typer.Exit(1) from None
 
     output.success(f"Created {file_path}")
 
@@ -212,6 +146,7 @@ def init(
 
 
 @app.command(name="expand")
+@_handle_errors
 def expand_cmd(
     session: Annotated[
         Path,
@@ -219,38 +154,18 @@ def expand_cmd(
     ] = Path("session.md"),
 ) -> None:
     """Expand [[references]] in the last human turn."""
-    if not session.exists():
-        if session.name == "session.md":
-            output.error("No session.md found")
-            output.info("Run 'ask init' to create session.md")
-        else:
-            output.error(f"File not found: {session}")
-        raise typer.Exit(1)
+    from ask.session import expand_session
 
-    try:
-        _, file_count = expand_session(str(session))
+    _require_session(session)
 
-        output.success(f"Expanded {file_count} file{'s' if file_count != 1 else ''}")
-        output.info(output.dim(f"Updated {session}"))
+    _, file_count = expand_session(str(session))
 
-    except AskError as e:
-        output.error(e.message)
-        if e.help_text:
-            output.blank()
-            output.info(e.help_text)
-        raise typer.Exit(1) from None
-    except Exception as e:
-        if isinstance(e, SystemExit):
-            raise
-        ask_error = AskError.from_exception(e)
-        output.error(ask_error.message)
-        if ask_error.help_text:
-            output.blank()
-            output.info(ask_error.help_text)
-        raise typer.Exit(1) from None
+    output.success(f"Expanded {file_count} file{'s' if file_count != 1 else ''}")
+    output.info(output.dim(f"Updated {session}"))
 
 
 @app.command(name="apply")
+@_handle_errors
 def apply_cmd(
     session: Annotated[
         Path,
@@ -270,25 +185,22 @@ def apply_cmd(
     ] = False,
 ) -> None:
     """Apply files and commands from AI response."""
-    if not session.exists():
-        if session.name == "session.md":
-            output.error("No session.md found")
-            output.info("Run 'ask init' to create session.md")
-        else:
-            output.error(f"File not found: {session}")
-        raise typer.Exit(1)
+    from ask.apply import apply_session, format_applied_block, print_apply_result
+    from ask.session import SessionEditor
+    from ask.workspace import find_workspace
 
-    try:
-        apply_files = True
-        apply_commands = True
+    _require_session(session)
+
+    apply_files = True
+    apply_commands = True
 
-        if files:
-            apply_commands = False
-        elif commands:
-            apply_files = False
+    if files:
+        apply_commands = False
+    elif commands:
+        apply_files = False
 
-        session_content = session.read_text(encoding="utf-8")
-        workspace = find_workspace(session_content)
+    with SessionEditor(str(session)) as editor:
+        workspace = find_workspace(editor.content)
 
         if dry_run:
             output.info(output.dim("Dry run - no changes will be made"))
@@ -302,82 +214,23 @@ def apply_cmd(
             dry_run=dry_run,
             apply_files=apply_files,
             apply_commands=apply_commands,
+            editor=editor,
         )
 
-        if result.file_results:
-            output.blank()
-            for fr in result.file_results:
-                if fr.error:
-                    output.error(f"{fr.path} - {fr.error}")
-                else:
-                    action_color = output.green if fr.action == "created" else output.cyan
-                    output.success(
-                        f"{fr.path} {output.dim('·')} "
-                        f"{action_color(fr.action)} {output.dim(f'({fr.size}B)')}"
-                    )
-
-        if result.command_results:
-            output.blank()
-            for cr in result.command_results:
-                if cr.status == "OK":
-                    output.success(f"{output.dim('$')} {cr.command}")
-                else:
-                    output.error(f"{output.dim('$')} {cr.command}")
-                    if cr.output:
-                        for line in cr.output.split("\n")[:5]:
-                            output.info(f"  {output.dim(line)}")
+        if not dry_run:
+            editor.insert_block(format_applied_block(result))
 
-        output.blank()
-        file_count = len(result.file_results)
-        cmd_count = len(result.command_results)
+    print_apply_result(result, dry_run=dry_run)
 
-        if dry_run:
-            parts: list[str] = []
-            if file_count:
-                parts.append(f"{file_count} file{'s' if file_count != 1 else ''}")
-            if cmd_count:
-                parts.append(f"{cmd_count} command{'s' if cmd_count != 1 else ''}")
-            output.info(f"Would apply: {', '.join(parts)}")
-        else:
-            if result.status == "OK":
-                parts = []
-                if file_count:
-                    parts.append(f"{file_count} file{'s' if file_count != 1 else ''}")
-                if cmd_count:
-                    parts.append(f"{cmd_count} command{'s' if cmd_count != 1 else ''}")
-                output.success(f"Applied {', '.join(parts)}")
-
-                applied_block = format_applied_block(result)
-                insert_applied_block(str(session), applied_block)
-                output.info(output.dim(f"Updated {session}"))
-            else:
-                output.warning("Apply completed with errors")
-
-                applied_block = format_applied_block(result)
-                insert_applied_block(str(session), applied_block)
-                output.info(output.dim(f"Updated {session}"))
-
-        if result.status != "OK":
-            raise typer.Exit(1)
-
-    except AskError as e:
-        output.error(e.message)
-        if e.help_text:
-            output.blank()
-            output.info(e.help_text)
-        raise typer.Exit(1) from None
-    except Exception as e:
-        if isinstance(e, SystemExit):
-            raise
-        ask_error = AskError.from_exception(e)
-        output.error(ask_error.message)
-        if ask_error.help_text:
-            output.blank()
-            output.info(ask_error.help_text)
-        raise typer.Exit(1) from None
+    if not dry_run:
+        output.info(output.dim(f"Updated {session}"))
+
+    if result.status != "OK":
+        raise typer.Exit(1)
 
 
 @app.command(name="check")
+@_handle_errors
 def check_cmd(
     session: Annotated[
         Path,
@@ -389,17 +242,14 @@ def check_cmd(
     ] = False,
 ) -> None:
     """Run verification checks (lint, type check, tests)."""
-    if not session.exists():
-        if session.name == "session.md":
-            output.error("No session.md found")
-            output.info("Run 'ask init' to create session.md")
-        else:
-            output.error(f"File not found: {session}")
-        raise typer.Exit(1)
+    from ask.check import check_session, print_check_result
+    from ask.session import SessionEditor
+    from ask.workspace import find_workspace
 
-    try:
-        session_content = session.read_text(encoding="utf-8")
-        workspace = find_workspace(session_content)
+    _require_session(session)
+
+    with SessionEditor(str(session)) as editor:
+        workspace = find_workspace(editor.content)
 
         if workspace:
             output.meta([("Workspace", str(workspace))])
@@ -410,51 +260,18 @@ def check_cmd(
         output.blank()
         output.info(output.dim("Running checks..."))
 
-        result = check_session(str(session), fix=fix)
+        result = check_session(str(session), fix=fix, editor=editor)
 
-        output.blank()
-        for r in result.results:
-            if r.status == "PASS":
-                summary_text = f" {output.dim(f'({r.summary})')}" if r.summary else ""
-                output.success(f"{r.id}{summary_text}")
-            elif r.status == "FAIL":
-                summary_text = f" {output.dim(f'({r.summary})')}" if r.summary else ""
-                output.error(f"{r.id}{summary_text}")
-            elif r.status == "TIMEOUT":
-                output.warning(f"{r.id} {output.dim('(timeout)')}")
-            else:
-                output.error(f"{r.id} {output.dim(f'({r.summary})')}")
-
-        output.blank()
-        if result.status == "PASS":
-            output.success("All checks passed")
-        else:
-            fail_count = sum(1 for r in result.results if r.status != "PASS")
-            output.error(f"{fail_count} check{'s' if fail_count != 1 else ''} failed")
+    print_check_result(result)
 
-        output.info(output.dim(f"Updated {session}"))
-
-        if result.status != "PASS":
-            raise typer.Exit(1)
+    output.info(output.dim(f"Updated {session}"))
 
-    except AskError as e:
-        output.error(e.message)
-        if e.help_text:
-            output.blank()
-            output.info(e.help_text)
-        raise typer.Exit(1) from None
-    except Exception as e:
-        if isinstance(e, SystemExit):
-            raise
-        ask_error = AskError.from_exception(e)
-        output.error(ask_error.message)
-        if ask_error.help_text:
-            output.blank()
-            output.info(ask_error.help_text)
-        raise typer.Exit(1) from None
+    if result.status != "PASS":
+        raise typer.Exit(1)
 
 
 @app.command()
+@_handle_errors
 def refresh(
     session: Annotated[
         Path,
@@ -470,50 +287,30 @@ def refresh(
     ] = False,
 ) -> None:
     """Re-expand all marked references in place."""
-    if not session.exists():
-        if session.name == "session.md":
-            output.error("No session.md found")
-            output.info("Run 'ask init' to create session.md")
-        else:
-            output.error(f"File not found: {session}")
-        raise typer.Exit(1)
+    from ask.refresh import print_refresh_result, refresh_session
 
-    try:
-        if dry_run:
-            output.info(output.dim("Dry run - no changes will be made"))
-            output.blank()
+    _require_session(session)
 
-        result = refresh_session(
-            str(session),
-            include_urls=url,
-            dry_run=dry_run,
-        )
+    if dry_run:
+        output.info(output.dim("Dry run - no changes will be made"))
+        output.blank()
 
-        print_refresh_result(result, dry_run=dry_run)
+    result = refresh_session(
+        str(session),
+        include_urls=url,
+        dry_run=dry_run,
+    )
 
-        if not dry_run and (
-            result.files_refreshed > 0 or result.dirs_refreshed > 0 or result.urls_refreshed > 0
-        ):
-            output.info(output.dim(f"Updated {session}"))
+    print_refresh_result(result, dry_run=dry_run)
 
-    except AskError as e:
-        output.error(e.message)
-        if e.help_text:
-            output.blank()
-            output.info(e.help_text)
-        raise typer.Exit(1) from None
-    except Exception as e:
-        if isinstance(e, SystemExit):
-            raise
-        ask_error = AskError.from_exception(e)
-        output.error(ask_error.message)
-        if ask_error.help_text:
-            output.blank()
-            output.info(ask_error.help_text)
-        raise typer.Exit(1) from None
+    if not dry_run and (
+        result.files_refreshed > 0 or result.dirs_refreshed > 0 or result.urls_refreshed > 0
+    ):
+        output.info(output.dim(f"Updated {session}"))
 
 
 @app.command()
+@_handle_errors
 def cfg(
     field: Annotated[
         str | None,
@@ -525,57 +322,48 @@ def cfg(
     ] = None,
 ) -> None:
     """View or update configuration."""
-    try:
-        if not field:
-            ensure_config()
-            config = load_config()
-            config_path = get_config_path()
+    from ask.config import ensure_config, get_config_path, load_config, save_config, update_config
+    from ask.types import Config
 
-            output.info(output.dim(f"Config: {config_path}"))
+    if not field:
+        ensure_config()
+        config = load_config()
+        config_path = get_config_path()
 
-            output.field("model", config.model)
-            output.field("temperature", str(config.temperature))
+        output.info(output.dim(f"Config: {config_path}"))
 
-            if config.max_tokens:
-                output.field("maxTokens", str(config.max_tokens))
-            else:
-                output.field_dim("maxTokens", "(AWS default)")
+        output.field("model", config.model)
+        output.field("temperature", str(config.temperature))
 
-            if config.region:
-                output.field("region", config.region)
-            else:
-                output.field_dim("region", "(no preference)")
+        if config.max_tokens:
+            output.field("maxTokens", str(config.max_tokens))
+        else:
+            output.field_dim("maxTokens", "(AWS default)")
 
-            output.field("filter", "on" if config.filter else "off")
+        if config.region:
+            output.field("region", config.region)
+        else:
+            output.field_dim("region", "(no preference)")
 
-            exclude = config.exclude or Config.default_exclude()
-            output.field("exclude", f"{len(exclude)} patterns")
+        output.field("filter", "on" if config.filter else "off")
 
-            return
+        exclude = config.exclude or Config.default_exclude()
+        output.field("exclude", f"{len(exclude)} patterns")
 
-        if field == "reset":
-            save_config(Config())
-            output.success("Reset to defaults")
-            return
+        return
 
-        if not value:
-            output.error(f"Missing value for '{field}'")
-            output.info(f"Usage: ask cfg {field} <value>")
-            raise typer.Exit(1)
+    if field == "reset":
+        save_config(Config())
+        output.success("Reset to defaults")
+        return
 
-        update_config(field, value)
-        output.success(f"{field} set to {value}")
+    if not value:
+        output.error(f"Missing value for '{field}'")
+        output.info(f"Usage: ask cfg {field} <value>")
+        raise typer.Exit(1)
 
-    except ConfigError as e:
-        output.error(e.message)
-        if e.help_text:
-            output.info(e.help_text)
-        raise typer.Exit(1) from None
-    except Exception as e:
-        if isinstance(e, SystemExit):
-            raise
-        output.error(str(e))
-        raise typer.Exit(1) from None
+    update_config(field, value)
+    output.success(f"{field} set to {value}")
 
 
 @app.command()
@@ -584,8 +372,36 @@ def version() -> None:
     output.info(get_version_string())
 
 
+def _single_command_app(name: str) -> typer.Typer | None:
+    """Build an app holding only the named subcommand, or None if there is none.
+
+    Click objects for every command are built when the full app runs; when the
+    subcommand is already known from argv only its own parser is needed.
+    """
+    for info in app.registered_commands:
+        if info.callback is None:
+            continue
+        if (info.name or info.callback.__name__.replace("_", "-")) == name:
+            single = typer.Typer(
+                add_completion=False, rich_markup_mode=None, pretty_exceptions_enable=False
+            )
+            single.registered_commands.append(info)
+            return single
+    return None
+
+
 def main() -> None:
     """Entry point for the CLI."""
+    args = sys.argv[1:]
+    if args in (["--version"], ["-V"], ["version"]):
+        output.info(get_version_string())
+        return
+    if not args:
+        # Bare `ask` is the common case: chat on ./session.md
+        args = ["chat"]
+    if (single := _single_command_app(args[0])) is not None:
+        single(args=args[1:], prog_name=f"ask {args[0]}")
+        return
     app()
 
 
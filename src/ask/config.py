@@ -5,6 +5,8 @@ from __future__ import annotations
 import json
 import os
 import re
+from dataclasses import replace
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, cast
 
@@ -22,31 +24,52 @@ def get_config_path() -> Path:
     return get_config_dir() / "config.jsonc"
 
 
+REGION_PATTERN = re.compile(r"^[a-z]{2}-[a-z]+-\d+$")
+
+# Accepted spellings for boolean settings such as `ask cfg filter off`
+TRUE_VALUES = frozenset({"on", "true", "yes", "1"})
+FALSE_VALUES = frozenset({"off", "false", "no", "0"})
+
+# Strings are matched first so comment markers inside them are left alone
+JSONC_TOKEN_PATTERN = re.compile(r'"(?:\\.|[^"\\\n])*"|//[^\n]*|/\*.*?\*/', re.DOTALL)
+
+
 def _strip_json_comments(text: str) -> str:
-    """Strip // comments from JSONC text."""
-    lines = text.split("\n")
-    stripped: list[str] = []
-    for line in lines:
-        comment_idx = line.find("//")
-        if comment_idx == -1:
-            stripped.append(line)
-            continue
-        before_comment = line[:comment_idx]
-        quote_count = before_comment.count('"')
-        if quote_count % 2 == 1:
-            stripped.append(line)
-        else:
-            stripped.append(line[:comment_idx])
-    return "\n".join(stripped)
+    """Strip // and /* */ comments from JSONC text in one regex pass."""
+    return JSONC_TOKEN_PATTERN.sub(_keep_json_string, text)
+
+
+def _keep_json_string(match: re.Match[str]) -> str:
+    """Keep string tokens; drop line comments, blank out block comments."""
+    token = match.group(0)
+    if token[0] == '"':
+        return token
+    return "" if token[1] == "/" else " "
 
 
 def load_config() -> Config:
-    """Load configuration from file."""
+    """Load configuration from file.
+
+    Parsed results are cached by path, mtime and size, so repeated calls
+    skip the read and parse until the file changes.
+    """
     config_path = get_config_path()
 
-    if not config_path.exists():
+    try:
+        stat = config_path.stat()
+    except FileNotFoundError:
         return Config()
 
+    config = _load_config_cached(config_path, stat.st_mtime_ns, stat.st_size)
+
+    # Callers may mutate the result, so hand out a copy
+    exclude = list(config.exclude) if config.exclude is not None else None
+    return replace(config, exclude=exclude)
+
+
+@lru_cache(maxsize=1)
+def _load_config_cached(config_path: Path, mtime_ns: int, size: int) -> Config:
+    """Read and parse the config file (cached per file version)."""
     try:
         text = config_path.read_text(encoding="utf-8")
         json_text = _strip_json_comments(text)
@@ -99,19 +122,26 @@ def save_config(config: Config) -> None:
     tmp_path.write_text(jsonc, encoding="utf-8")
     tmp_path.rename(config_path)
 
+    # Coarse filesystem timestamps can leave mtime/size unchanged after a
+    # rewrite, so drop the cached parse rather than trust the stat key
+    _load_config_cached.cache_clear()
+
 
 def _format_config_with_comments(config: Config) -> str:
-    """Format config as JSONC with comments."""
+    """Format config as JSONC with comments.
+
+    Values go through json.dumps so quotes and backslashes are escaped.
+    """
     lines: list[str] = [
         "{",
         "  // AI model: opus, sonnet, haiku",
-        f'  "model": "{config.model}",',
+        f'  "model": {json.dumps(config.model)},',
         "",
         "  // Response creativity (0.0-1.0)",
-        f'  "temperature": {config.temperature},',
+        f'  "temperature": {json.dumps(config.temperature)},',
         "",
         "  // Strip comments from expanded files",
-        f'  "filter": {str(config.filter).lower()},',
+        f'  "filter": {json.dumps(config.filter)},',
     ]
 
     if config.max_tokens is not None:
@@ -119,7 +149,7 @@ def _format_config_with_comments(config: Config) -> str:
             [
                 "",
                 "  // Maximum response tokens",
-                f'  "maxTokens": {config.max_tokens},',
+                f'  "maxTokens": {json.dumps(config.max_tokens)},',
             ]
         )
 
@@ -128,7 +158,7 @@ def _format_config_with_comments(config: Config) -> str:
             [
                 "",
                 "  // Preferred AWS region",
-                f'  "region": "{config.region}",',
+                f'  "region": {json.dumps(config.region)},',
             ]
         )
 
@@ -143,7 +173,7 @@ def _format_config_with_comments(config: Config) -> str:
 
     for i, pattern in enumerate(exclude):
         comma = "," if i < len(exclude) - 1 else ""
-        lines.append(f'    "{pattern}"{comma}')
+        lines.append(f"    {json.dumps(pattern)}{comma}")
 
     lines.extend(
         [
@@ -183,7 +213,7 @@ def update_config(field: str, value: str | float | int | bool) -> None:
         config.max_tokens = tokens
     elif field == "region":
         str_value = str(value)
-        if not re.match(r"^[a-z]{2}-[a-z]+-\d+$", str_value):
+        if not REGION_PATTERN.match(str_value):
             raise ConfigError("Invalid AWS region format", "Example: us-west-2, eu-central-1")
         config.region = str_value
     elif field == "filter":
@@ -202,8 +232,8 @@ def _parse_bool(value: str | float | int | bool) -> bool:
     if isinstance(value, bool):
         return value
     lower = str(value).lower()
-    if lower in ("on", "true", "yes", "1"):
+    if lower in TRUE_VALUES:
         return True
-    if lower in ("off", "false", "no", "0"):
+    if lower in FALSE_VALUES:
         return False
     raise ConfigError("Invalid value", "Use: on/off, true/false, yes/no")
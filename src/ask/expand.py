@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import cast
 
@@ -18,6 +21,20 @@ from ask.types import Config
 # Zero-width space for escaping brackets
 ZWS = "\u200b"
 
+REFERENCE_PATTERN = re.compile(r"\[\[([^\]\u200B]+)\]\]")
+NUMERIC_PREFIX_PATTERN = re.compile(r"^(\d+)")
+DIR_SUFFIX_PATTERN = re.compile(r"/?(\*\*)?\/?$")
+FENCE_RUN_PATTERN = re.compile(r"`{3,}")
+
+# Leading bytes checked for NUL when deciding a file is binary
+BINARY_SNIFF_BYTES = 512
+
+# Files larger than this are treated as data and expanded unfiltered
+MAX_FILTER_CHARS = 1_000_000
+
+# Upper bound on threads reading files for one directory reference
+MAX_EXPAND_WORKERS = 16
+
 
 def natural_sort_key(path: Path) -> tuple[float, str]:
     """Sort key that orders numeric prefixes naturally.
@@ -32,7 +49,7 @@ def natural_sort_key(path: Path) -> tuple[float, str]:
         README.md → (inf, "README.md")
     """
     name = path.name
-    match = re.match(r"^(\d+)", name)
+    match = NUMERIC_PREFIX_PATTERN.match(name)
     if match:
         return (int(match.group(1)), name)
     return (float("inf"), name)
@@ -41,23 +58,44 @@ def natural_sort_key(path: Path) -> tuple[float, str]:
 def expand_references(content: str, config: Config) -> tuple[str, int]:
     """Expand all [[ref]] references in content.
 
+    References are expanded concurrently, so several URLs are fetched in
+    parallel rather than one after another.
+
     Returns tuple of (expanded_content, file_count).
     """
-    pattern = re.compile(r"\[\[([^\]\u200B]+)\]\]")
-    expanded = content
+    if "[[" not in content:
+        return content, 0
+
+    matches = list(REFERENCE_PATTERN.finditer(content))
+    if not matches:
+        return content, 0
+
+    refs = [match.group(1) for match in matches]
+    if len(refs) == 1:
+        results = [_try_expand_reference(refs[0], config)]
+    else:
+        with ThreadPoolExecutor(max_workers=min(MAX_EXPAND_WORKERS, len(refs))) as executor:
+            results = list(executor.map(lambda ref: _try_expand_reference(ref, config), refs))
+
+    parts: list[str] = []
     file_count = 0
+    last_end = 0
+    for match, (text, files) in zip(matches, results, strict=True):
+        parts.append(content[last_end : match.start()])
+        parts.append(text)
+        file_count += files
+        last_end = match.end()
+    parts.append(content[last_end:])
+
+    return "".join(parts), file_count
 
-    for match in pattern.finditer(content):
-        ref = match.group(1)
-        try:
-            text, files = _expand_reference(ref, config)
-            expanded = expanded.replace(match.group(0), text, 1)
-            file_count += files
-        except Exception as e:
-            error_msg = str(e)
-            expanded = expanded.replace(match.group(0), f"\n❌ Error: {ref} - {error_msg}\n", 1)
 
-    return expanded, file_count
+def _try_expand_reference(ref: str, config: Config) -> tuple[str, int]:
+    """Expand a reference, or return an inline error marker if it fails."""
+    try:
+        return _expand_reference(ref, config)
+    except Exception as e:
+        return f"\n❌ Error: {ref} - {e}\n", 0
 
 
 def _expand_reference(ref: str, config: Config) -> tuple[str, int]:
@@ -68,14 +106,12 @@ def _expand_reference(ref: str, config: Config) -> tuple[str, int]:
     is_recursive = ref.endswith("/**/")
     is_directory = ref.endswith("/") or is_recursive
 
-    # Check if path is actually a directory
-    if not is_directory:
-        path = Path(ref)
-        if path.exists() and path.is_dir():
-            return _expand_directory(ref, recursive=False, config=config)
+    # Check if path is actually a directory (is_dir() is False for missing paths)
+    if not is_directory and Path(ref).is_dir():
+        return _expand_directory(ref, recursive=False, config=config)
 
     if is_directory:
-        dir_path = re.sub(r"/?(\*\*)?\/?$", "", ref)
+        dir_path = DIR_SUFFIX_PATTERN.sub("", ref)
         return _expand_directory(dir_path, recursive=is_recursive, config=config)
 
     return _expand_file(ref, config)
@@ -150,27 +186,35 @@ def expand_url(url: str, config: Config) -> tuple[str, int]:
 def _expand_file(path: str, config: Config) -> tuple[str, int]:
     """Expand a single file reference."""
     resolved_path = resolve_file_path(path)
+    path_str = str(resolved_path)
 
-    # Check if binary
-    if _is_binary_file(resolved_path):
-        raise ValueError("Binary file")
+    # One open serves both the binary sniff and the text; binaries are
+    # rejected after reading only their first BINARY_SNIFF_BYTES
+    with resolved_path.open("rb") as f:
+        head = f.read(BINARY_SNIFF_BYTES)
+        if b"\x00" in head:
+            raise ValueError("Binary file")
+        data = head + f.read()
 
-    content = resolved_path.read_text(encoding="utf-8")
+    content = data.decode("utf-8")
+    if "\r" in content:
+        # Match read_text()'s universal newline handling
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
 
     # Apply filtering if enabled
-    if should_filter(config.filter):
-        content = filter_content(content, str(resolved_path))
+    if should_filter(config.filter) and len(content) <= MAX_FILTER_CHARS:
+        content = filter_content(content, path_str)
 
     # Escape brackets
     content = content.replace("[[", f"[{ZWS}[")
     content = content.replace("]]", f"]{ZWS}]")
 
-    lang = language_for(str(resolved_path))
+    lang = language_for(path_str)
     fence = _fence_for(content)
 
     lines = [
-        f"<!-- file: {resolved_path} -->",
-        f"### {resolved_path}",
+        f"<!-- file: {path_str} -->",
+        f"### {path_str}",
         f"{fence}{lang}",
         content,
         fence,
@@ -188,38 +232,18 @@ def _expand_directory(path: str, recursive: bool, config: Config) -> tuple[str,
 
     exclude = config.exclude if config.exclude is not None else Config.default_exclude()
 
-    sections: list[str] = []
-    file_count = 0
-    has_subdirs = False
+    files, has_subdirs = _scan_directory(dir_path, recursive, exclude)
 
-    # Check for subdirectories if non-recursive
-    if not recursive:
-        for entry in dir_path.iterdir():
-            if should_exclude(str(entry), exclude):
-                continue
-            if entry.is_dir():
-                has_subdirs = True
-                break
-
-    # Collect files with natural sort
-    if recursive:
-        file_paths = sorted(dir_path.rglob("*"), key=natural_sort_key)
+    # Reads dominate, so overlap them; map() keeps natural sort order. Off the
+    # main thread we are already a worker of an outer pool (several references,
+    # or refresh), so read sequentially rather than nesting pools.
+    if len(files) > 1 and threading.current_thread() is threading.main_thread():
+        with ThreadPoolExecutor(max_workers=min(MAX_EXPAND_WORKERS, len(files))) as executor:
+            texts = list(executor.map(lambda file_path: _try_expand_file(file_path, config), files))
     else:
-        file_paths = sorted(dir_path.glob("*"), key=natural_sort_key)
-
-    for file_path in file_paths:
-        if not file_path.is_file():
-            continue
-        if should_exclude(str(file_path), exclude):
-            continue
-
-        try:
-            text, _ = _expand_file(str(file_path), config)
-            sections.append(text)
-            file_count += 1
-        except Exception:
-            # Skip files that can't be expanded
-            pass
+        texts = [_try_expand_file(file_path, config) for file_path in files]
+    sections = [text for text in texts if text is not None]
+    file_count = len(sections)
 
     if not sections:
         if has_subdirs:
@@ -237,16 +261,49 @@ def _expand_directory(path: str, recursive: bool, config: Config) -> tuple[str,
     return wrapped, file_count
 
 
-def _is_binary_file(path: Path) -> bool:
-    """Check if a file is binary."""
-    with path.open("rb") as f:
-        preview = f.read(512)
-    return b"\x00" in preview
+def _scan_directory(root: Path, recursive: bool, exclude: list[str]) -> tuple[list[Path], bool]:
+    """List non-excluded files under root in natural sort order.
+
+    Also reports whether root has non-excluded subdirectories (non-recursive
+    only). Uses os.scandir so file/dir checks come from the directory read
+    rather than a stat per entry; like rglob, symlinked directories are not
+    descended into.
+    """
+    files: list[Path] = []
+    has_subdirs = False
+    pending = [root]
+
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                # Path() drops a leading "./" so names match what glob() gave
+                path = Path(entry.path)
+                if entry.is_dir():
+                    if recursive:
+                        if not entry.is_symlink():
+                            pending.append(path)
+                    elif not should_exclude(str(path), exclude):
+                        has_subdirs = True
+                elif entry.is_file() and not should_exclude(str(path), exclude):
+                    files.append(path)
+
+    files.sort(key=natural_sort_key)
+    return files, has_subdirs
+
+
+def _try_expand_file(path: Path, config: Config) -> str | None:
+    """Expand a file inside a directory, or None if it can't be expanded."""
+    try:
+        text, _ = _expand_file(str(path), config)
+    except Exception:
+        # Skip files that can't be expanded
+        return None
+    return text
 
 
 def _fence_for(content: str) -> str:
     """Get the appropriate code fence for content."""
     max_length = 2
-    for match in re.finditer(r"`{3,}", content):
+    for match in FENCE_RUN_PATTERN.finditer(content):
         max_length = max(max_length, len(match.group(0)))
     return "`" * (max_length + 1)
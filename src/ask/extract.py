@@ -5,6 +5,30 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass
 
+# File markers with content between them
+FILE_BLOCK_PATTERN = re.compile(
+    r"<!-- file: ([^\s>]+) -->\s*\n"  # Opening marker with path
+    r"(.*?)"  # Content (non-greedy)
+    r"<!-- /file -->",  # Closing marker
+    re.DOTALL,
+)
+
+# Command markers with content between them
+COMMAND_BLOCK_PATTERN = re.compile(
+    r"<!-- ask:command -->\s*\n"  # Opening marker
+    r"(.*?)"  # Content (non-greedy)
+    r"<!-- /ask:command -->",  # Closing marker
+    re.DOTALL,
+)
+
+# Code fence with optional language hint, closed by a fence of the same length
+FENCE_BLOCK_PATTERN = re.compile(
+    r"^(`{3,})(\w*)\s*\n"  # Opening fence
+    r"(.*?)"  # Content
+    r"^\1\s*$",  # Closing fence (same length)
+    re.MULTILINE | re.DOTALL,
+)
+
 
 @dataclass
 class FileBlock:
@@ -29,15 +53,7 @@ def extract_file_blocks(content: str) -> list[FileBlock]:
     """
     blocks: list[FileBlock] = []
 
-    # Pattern to match file markers with content between them
-    file_pattern = re.compile(
-        r"<!-- file: ([^\s>]+) -->\s*\n"  # Opening marker with path
-        r"(.*?)"  # Content (non-greedy)
-        r"<!-- /file -->",  # Closing marker
-        re.DOTALL,
-    )
-
-    for match in file_pattern.finditer(content):
+    for match in FILE_BLOCK_PATTERN.finditer(content):
         path = match.group(1)
         raw_content = match.group(2)
 
@@ -57,15 +73,7 @@ def extract_command_blocks(content: str) -> list[CommandBlock]:
     """
     blocks: list[CommandBlock] = []
 
-    # Pattern to match command markers with content between them
-    cmd_pattern = re.compile(
-        r"<!-- ask:command -->\s*\n"  # Opening marker
-        r"(.*?)"  # Content (non-greedy)
-        r"<!-- /ask:command -->",  # Closing marker
-        re.DOTALL,
-    )
-
-    for match in cmd_pattern.finditer(content):
+    for match in COMMAND_BLOCK_PATTERN.finditer(content):
         raw_content = match.group(1)
 
         # Extract command from code fence
@@ -85,15 +93,7 @@ def _extract_fence_content(raw: str) -> str | None:
     Handles fences of varying backtick lengths.
     Returns None if no valid fence found.
     """
-    # Match opening fence with optional language hint
-    fence_pattern = re.compile(
-        r"^(`{3,})(\w*)\s*\n"  # Opening fence
-        r"(.*?)"  # Content
-        r"^\1\s*$",  # Closing fence (same length)
-        re.MULTILINE | re.DOTALL,
-    )
-
-    match = fence_pattern.search(raw)
+    match = FENCE_BLOCK_PATTERN.search(raw)
     if match:
         content = match.group(3)
         # Remove trailing newline if present
@@ -14,12 +14,16 @@ PRESERVE_PATTERNS = [
     re.compile(r'^[\'"]use strict[\'"];?$'),
 ]
 
-HEADER_PATTERNS = [
-    {"start": re.compile(r"^/\*+"), "end": re.compile(r"\*+/")},
-    {"start": re.compile(r"^<!--"), "end": re.compile(r"-->")},
-    {"start": re.compile(r'^"""'), "end": re.compile(r'"""')},
-    {"start": re.compile(r"^'''"), "end": re.compile(r"'''")},
-]
+# PRESERVE_PATTERNS as one alternation, so each line costs a single match
+PRESERVE_PATTERN = re.compile("|".join(f"(?:{p.pattern})" for p in PRESERVE_PATTERNS))
+
+# (start, end) delimiters of header blocks stripped from the top of a file
+HEADER_DELIMITERS = (
+    ("/*", "*/"),
+    ("<!--", "-->"),
+    ('"""', '"""'),
+    ("'''", "'''"),
+)
 
 
 @dataclass
@@ -38,6 +42,16 @@ COMMENT_PATTERNS = {
     "html": CommentStyle(block_start="<!--", block_end="-->"),
 }
 
+C_STYLE_EXTS = ("js", "ts", "jsx", "tsx", "java", "c", "cpp", "cs", "go", "swift", "kt", "rs")
+HASH_EXTS = ("py", "rb", "sh", "bash", "zsh", "yaml", "yml", "toml")
+
+# Known extensions decide the style without looking at the content
+COMMENT_STYLE_BY_EXT: dict[str, CommentStyle] = {
+    **dict.fromkeys(C_STYLE_EXTS, COMMENT_PATTERNS["c_style"]),
+    **dict.fromkeys(HASH_EXTS, COMMENT_PATTERNS["hash"]),
+    "sql": COMMENT_PATTERNS["sql"],
+}
+
 
 def should_filter(config_filter: bool | None) -> bool:
     """Check if content filtering is enabled."""
@@ -55,16 +69,21 @@ def filter_content(content: str, file_path: str) -> str:
 
 def _strip_headers(content: str) -> str:
     """Remove file headers (license blocks, docstrings, etc.)."""
-    trimmed = content.lstrip()
-
-    for pattern in HEADER_PATTERNS:
-        if pattern["start"].match(trimmed):
-            end_match = pattern["end"].search(trimmed)
-            if end_match:
-                after_header = trimmed[end_match.end() :]
-                return _strip_headers(after_header)
-
-    return content
+    # Offset just past the last header removed
+    pos = 0
+    while True:
+        i = pos
+        while i < len(content) and content[i].isspace():
+            i += 1
+
+        for start, end in HEADER_DELIMITERS:
+            if content.startswith(start, i):
+                end_idx = content.find(end, i + len(start))
+                if end_idx != -1:
+                    pos = end_idx + len(end)
+                    break
+        else:
+            return content[pos:]
 
 
 def _strip_comments(content: str, file_path: str) -> str:
@@ -73,23 +92,27 @@ def _strip_comments(content: str, file_path: str) -> str:
     if not style:
         return content
 
-    lines = content.split("\n")
     result: list[str] = []
+    append = result.append
+    preserve = PRESERVE_PATTERN.match
+    line_marker = style.line
+    block_start = style.block_start
+    block_end = style.block_end
     in_block = False
 
-    for line in lines:
+    for line in content.split("\n"):
         # Check if line should be preserved
         stripped = line.strip()
-        if any(p.match(stripped) for p in PRESERVE_PATTERNS):
-            result.append(line)
+        if preserve(stripped):
+            append(line)
             continue
 
         # Handle block comments
-        if style.block_start and not in_block and stripped.startswith(style.block_start):
+        if block_start and not in_block and stripped.startswith(block_start):
             in_block = True
             continue
 
-        if in_block and style.block_end and style.block_end in line:
+        if in_block and block_end and block_end in line:
             in_block = False
             continue
 
@@ -97,47 +120,34 @@ def _strip_comments(content: str, file_path: str) -> str:
             continue
 
         # Handle line comments
-        if style.line:
-            comment_idx = line.find(style.line)
+        if line_marker:
+            comment_idx = line.find(line_marker)
             if comment_idx == 0:
                 continue
             if comment_idx > 0:
                 before = line[:comment_idx].rstrip()
                 if before:
-                    result.append(before)
+                    append(before)
                 continue
 
-        result.append(line)
+        append(line)
 
     return "\n".join(result)
 
 
 def _detect_comment_style(content: str, file_path: str) -> CommentStyle | None:
     """Detect the comment style for a file."""
-    # Check content patterns
-    if "//" in content and ("/*" in content or re.search(r"\.(js|ts|java|c|cpp|go)$", file_path)):
-        return COMMENT_PATTERNS["c_style"]
-
-    if re.search(r"^\s*#", content, re.MULTILINE) and re.search(
-        r"\.(py|rb|sh|yaml|yml)$", file_path
-    ):
-        return COMMENT_PATTERNS["hash"]
-
-    if "<!--" in content:
-        return COMMENT_PATTERNS["html"]
-
-    if "--" in content and file_path.endswith(".sql"):
-        return COMMENT_PATTERNS["sql"]
-
     # Check by extension
     ext = file_path.rsplit(".", 1)[-1].lower() if "." in file_path else ""
+    style = COMMENT_STYLE_BY_EXT.get(ext)
+    if style:
+        return style
 
-    c_style_exts = {"js", "ts", "jsx", "tsx", "java", "c", "cpp", "cs", "go", "swift", "kt", "rs"}
-    if ext in c_style_exts:
+    # Fall back to content patterns for unknown extensions
+    if "//" in content and "/*" in content:
         return COMMENT_PATTERNS["c_style"]
 
-    hash_exts = {"py", "rb", "sh", "bash", "zsh", "yaml", "yml", "toml"}
-    if ext in hash_exts:
-        return COMMENT_PATTERNS["hash"]
+    if "<!--" in content:
+        return COMMENT_PATTERNS["html"]
 
     return None
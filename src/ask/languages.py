@@ -73,6 +73,9 @@ FILENAMES: dict[str, str] = {
     "setup.cfg": "ini",
 }
 
+# Case-insensitive view of FILENAMES, built once instead of scanned per call
+FILENAMES_LOWER: dict[str, str] = {name.lower(): lang for name, lang in FILENAMES.items()}
+
 
 def language_for(path: str) -> str:
     """Get the language identifier for a file path."""
@@ -84,10 +87,9 @@ def language_for(path: str) -> str:
         return FILENAMES[filename]
 
     # Check case-insensitive filename match
-    lower_filename = filename.lower()
-    for name, lang in FILENAMES.items():
-        if name.lower() == lower_filename:
-            return lang
+    lang = FILENAMES_LOWER.get(filename.lower())
+    if lang is not None:
+        return lang
 
     # Get extension
     if "." not in filename or filename.startswith("."):
@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import re
 import sys
 
+# Bedrock model ID parts hidden in display: provider prefix, date and version
+MODEL_ID_NOISE_PATTERN = re.compile(r"^anthropic\.|-\d{8}.*$|-v\d+:\d+$")
+
 
 class Output:
     """Formatted output helpers."""
@@ -18,6 +22,10 @@ class Output:
     BLUE = "\033[34m"
     CYAN = "\033[36m"
 
+    def __init__(self) -> None:
+        # Decided on first print, so importing never touches sys.stdout
+        self._flush_lines: bool | None = None
+
     def success(self, msg: str) -> None:
         """Print success message."""
         self._print(f"{self.GREEN}✓{self.RESET} {msg}")
@@ -60,11 +68,7 @@ class Output:
 
     def model_name(self, model_id: str) -> str:
         """Format model name for display."""
-        import re
-
-        name = re.sub(r"^anthropic\.", "", model_id)
-        name = re.sub(r"-\d{8}.*$", "", name)
-        name = re.sub(r"-v\d+:\d+$", "", name)
+        name = MODEL_ID_NOISE_PATTERN.sub("", model_id)
         return f"{self.CYAN}{name}{self.RESET}"
 
     def field(self, key: str, value: str, width: int = 12) -> None:
@@ -102,12 +106,19 @@ class Output:
         sys.stdout.flush()
 
     def _print(self, msg: str) -> None:
-        """Print to stdout."""
+        """Print to stdout, flushing per line only on a terminal."""
         sys.stdout.write(msg + "\n")
-        sys.stdout.flush()
+        if self._flush_lines is None:
+            # Terminals need each line shown at once; pipes and files can buffer
+            isatty = getattr(sys.stdout, "isatty", None)
+            self._flush_lines = bool(isatty and isatty())
+        if self._flush_lines:
+            sys.stdout.flush()
 
     def _print_err(self, msg: str) -> None:
         """Print to stderr."""
+        # Keep buffered stdout lines ahead of the error
+        sys.stdout.flush()
         sys.stderr.write(msg + "\n")
         sys.stderr.flush()
 
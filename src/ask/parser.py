@@ -3,10 +3,20 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
+from typing import Literal
 
-from ask.regions import find_excluded_regions, is_in_excluded_region
+from ask.regions import build_excluded_mask, find_excluded_regions
 from ask.types import Turn
 
+# Turn header: # [N] Human or # [N] AI
+TURN_PATTERN = re.compile(r"^# \[(\d+)\] (Human|AI)\s*$")
+# The `_` input marker on its own line
+INPUT_MARKER_PATTERN = re.compile(r"^_\s*$")
+# 6-backtick wrapper around AI responses
+AI_OPEN_PATTERN = re.compile(r"^`{6}markdown\s*$")
+AI_CLOSE_PATTERN = re.compile(r"^`{6}\s*$")
+
 
 def parse_turns(content: str) -> list[Turn]:
     """Parse session content into turns.
@@ -16,57 +26,84 @@ def parse_turns(content: str) -> list[Turn]:
 
     AI turns wrapped in 6 backticks are automatically unwrapped.
     """
+    lines, excluded = _split_session(content)
+    turn_starts = _find_turn_starts(lines, excluded)
+
+    # Extract content for each turn
+    turns: list[Turn] = []
+
+    for idx, (start_line, turn_number, role) in enumerate(turn_starts):
+        # Content ends at next turn header or end of file
+        content_end = turn_starts[idx + 1][0] if idx + 1 < len(turn_starts) else len(lines)
+        turns.append(_build_turn(lines, start_line, content_end, turn_number, role))
+
+    return turns
+
+
+def find_last_turn(content: str, role: Literal["Human", "AI"]) -> Turn | None:
+    """Find the last turn with the given role.
+
+    Only the matching turn's content is extracted and unwrapped,
+    so this is cheaper than parse_turns when a single turn is needed.
+    """
+    lines, excluded = _split_session(content)
+    turn_starts = _find_turn_starts(lines, excluded)
+
+    for idx in range(len(turn_starts) - 1, -1, -1):
+        start_line, turn_number, turn_role = turn_starts[idx]
+        if turn_role != role:
+            continue
+        content_end = turn_starts[idx + 1][0] if idx + 1 < len(turn_starts) else len(lines)
+        return _build_turn(lines, start_line, content_end, turn_number, turn_role)
+
+    return None
+
+
+@lru_cache(maxsize=1)
+def _split_session(content: str) -> tuple[list[str], bytearray]:
+    """Split content into lines and mark the lines in excluded regions.
+
+    Cached for the latest content, since a command often runs several
+    parsers over the same session text. Callers must not mutate the result.
+    """
     lines = content.split("\n")
-    regions = find_excluded_regions(lines)
+    return lines, build_excluded_mask(lines, find_excluded_regions(lines))
 
-    turn_pattern = re.compile(r"^# \[(\d+)\] (Human|AI)\s*$")
 
-    # Find all turn header positions
-    turn_starts: list[tuple[int, int, str]] = []  # (line_index, turn_number, role)
+def _find_turn_starts(lines: list[str], excluded: bytearray) -> list[tuple[int, int, str]]:
+    """Find turn header positions as (line_index, turn_number, role)."""
+    turn_starts: list[tuple[int, int, str]] = []
 
     for i, line in enumerate(lines):
-        if is_in_excluded_region(i, regions):
+        if excluded[i]:
             continue
 
-        match = turn_pattern.match(line)
+        match = TURN_PATTERN.match(line)
         if match:
             turn_number = int(match.group(1))
             role = match.group(2)
             turn_starts.append((i, turn_number, role))
 
-    if not turn_starts:
-        return []
+    return turn_starts
 
-    # Extract content for each turn
-    turns: list[Turn] = []
 
-    for idx, (start_line, turn_number, role) in enumerate(turn_starts):
-        # Content starts after the header line
-        content_start = start_line + 1
+def _build_turn(
+    lines: list[str], start_line: int, content_end: int, turn_number: int, role: str
+) -> Turn:
+    """Build a turn from the lines between its header and content_end."""
+    # Content starts after the header line
+    turn_content = "\n".join(lines[start_line + 1 : content_end])
 
-        # Content ends at next turn header or end of file
-        content_end = turn_starts[idx + 1][0] if idx + 1 < len(turn_starts) else len(lines)
-
-        # Extract content lines
-        content_lines = lines[content_start:content_end]
-        turn_content = "\n".join(content_lines)
-
-        # Unwrap AI responses from 6-backtick wrapper
-        if role == "AI":
-            turn_content = _unwrap_ai_response(turn_content)
+    # Unwrap AI responses from 6-backtick wrapper
+    if role == "AI":
+        turn_content = _unwrap_ai_response(turn_content)
 
-        # Strip leading/trailing whitespace but preserve internal structure
-        turn_content = turn_content.strip()
-
-        turns.append(
-            Turn(
-                number=turn_number,
-                role=role,  # type: ignore[arg-type]
-                content=turn_content,
-            )
-        )
-
-    return turns
+    # Strip leading/trailing whitespace but preserve internal structure
+    return Turn(
+        number=turn_number,
+        role=role,  # type: ignore[arg-type]
+        content=turn_content.strip(),
+    )
 
 
 def _unwrap_ai_response(content: str) -> str:
@@ -81,19 +118,20 @@ def _unwrap_ai_response(content: str) -> str:
 
     This function removes the outer wrapper if present.
     """
-    lines = content.split("\n")
+    # Any opening line contains this, so most turns skip the line scan
+    if "``````markdown" not in content:
+        return content
 
-    # Find opening: line starting with exactly 6 backticks followed by markdown
-    opening_pattern = re.compile(r"^`{6}markdown\s*$")
-    closing_pattern = re.compile(r"^`{6}\s*$")
+    lines = content.split("\n")
 
     opening_idx: int | None = None
     closing_idx: int | None = None
 
     # Find first opening
     for i, line in enumerate(lines):
+        # Line starting with exactly 6 backticks followed by markdown
         stripped = line.strip()
-        if opening_pattern.match(stripped):
+        if AI_OPEN_PATTERN.match(stripped):
             opening_idx = i
             break
 
@@ -103,7 +141,7 @@ def _unwrap_ai_response(content: str) -> str:
     # Find matching closing (must be exactly 6 backticks)
     for i in range(len(lines) - 1, opening_idx, -1):
         stripped = lines[i].strip()
-        if closing_pattern.match(stripped):
+        if AI_CLOSE_PATTERN.match(stripped):
             closing_idx = i
             break
 
@@ -121,36 +159,28 @@ def find_input_marker(content: str) -> tuple[int, int] | None:
     Returns (line_index, char_position) if found, None otherwise.
     The marker must be on its own line, outside code fences and marker blocks.
     """
-    lines = content.split("\n")
-    regions = find_excluded_regions(lines)
-
-    marker_pattern = re.compile(r"^_\s*$")
+    lines, excluded = _split_session(content)
 
+    # Track the line's character offset as we go instead of re-summing prior lines
+    char_pos = 0
     for i, line in enumerate(lines):
-        if is_in_excluded_region(i, regions):
-            continue
-
-        if marker_pattern.match(line):
-            # Calculate character position
-            char_pos = sum(len(lines[j]) + 1 for j in range(i))
+        if not excluded[i] and INPUT_MARKER_PATTERN.match(line):
             return (i, char_pos)
+        char_pos += len(line) + 1
 
     return None
 
 
 def count_input_markers(content: str) -> int:
     """Count `_` input markers in content (outside excluded regions)."""
-    lines = content.split("\n")
-    regions = find_excluded_regions(lines)
-
-    marker_pattern = re.compile(r"^_\s*$")
+    lines, excluded = _split_session(content)
     count = 0
 
     for i, line in enumerate(lines):
-        if is_in_excluded_region(i, regions):
+        if excluded[i]:
             continue
 
-        if marker_pattern.match(line):
+        if INPUT_MARKER_PATTERN.match(line):
             count += 1
 
     return count
@@ -3,32 +3,57 @@
 from __future__ import annotations
 
 import fnmatch
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 
+@dataclass(frozen=True)
+class ExcludeMatcher:
+    """Exclude patterns compiled once for matching many paths."""
+
+    glob: re.Pattern[str] | None  # All patterns as one fnmatch alternation
+    bases: frozenset[str]  # Pattern bases matched against path segments
+    dirs: frozenset[str]  # Directories excluded by "dir/**" patterns
+    dir_prefixes: tuple[str, ...]  # The same directories with a trailing "/"
+
+
 def should_exclude(path: str, patterns: list[str]) -> bool:
     """Check if a path should be excluded based on patterns."""
+    if not patterns:
+        return False
+
+    matcher = _compile_excludes(tuple(patterns))
     normalized_path = path.replace("\\", "/")
 
-    for pattern in patterns:
-        # Try direct glob match
-        if fnmatch.fnmatch(normalized_path, pattern):
-            return True
+    # Try direct glob match
+    if matcher.glob and matcher.glob.match(os.path.normcase(normalized_path)):
+        return True
 
-        # Check if any path segment matches the pattern base
-        segments = normalized_path.split("/")
-        pattern_base = pattern.replace("/**", "").replace("/*", "").rstrip("/")
+    # Check if any path segment matches a pattern base
+    if not matcher.bases.isdisjoint(normalized_path.split("/")):
+        return True
 
-        if pattern_base in segments:
-            return True
+    # Check if path is under an excluded directory
+    return normalized_path in matcher.dirs or normalized_path.startswith(matcher.dir_prefixes)
 
-        # Check if path is under an excluded directory
-        if pattern.endswith("/**"):
-            dir_pattern = pattern[:-3]  # Remove /**
-            if normalized_path.startswith(dir_pattern + "/") or normalized_path == dir_pattern:
-                return True
 
-    return False
+@lru_cache(maxsize=32)
+def _compile_excludes(patterns: tuple[str, ...]) -> ExcludeMatcher:
+    """Compile exclude patterns into a single matcher."""
+    # normcase mirrors what fnmatch.fnmatch does on each call
+    globs = [fnmatch.translate(os.path.normcase(pattern)) for pattern in patterns]
+    dirs = [pattern[:-3] for pattern in patterns if pattern.endswith("/**")]
+    return ExcludeMatcher(
+        glob=re.compile("|".join(globs)) if globs else None,
+        bases=frozenset(
+            pattern.replace("/**", "").replace("/*", "").rstrip("/") for pattern in patterns
+        ),
+        dirs=frozenset(dirs),
+        dir_prefixes=tuple(f"{d}/" for d in dirs),
+    )
 
 
 def resolve_file_path(path: str) -> Path:
@@ -42,9 +67,29 @@ def resolve_file_path(path: str) -> Path:
     if not parent.exists():
         raise FileNotFoundError(f"File not found: {path}")
 
-    filename = file_path.name.lower()
-    for entry in parent.iterdir():
-        if entry.name.lower() == filename:
-            return entry
+    # Cached per directory state. Coarse filesystem timestamps can leave the
+    # key unchanged after an entry is added, so a miss re-lists the directory
+    # before giving up; only hits are served from the cache.
+    stat = parent.stat()
+    key = file_path.name.lower()
+    name = _cached_dir_index(str(parent), stat.st_mtime_ns, stat.st_size, stat.st_nlink).get(key)
+    if name is None:
+        name = _dir_index(str(parent)).get(key)
+    if name is not None:
+        return parent / name
 
     raise FileNotFoundError(f"File not found: {path}")
+
+
+@lru_cache(maxsize=256)
+def _cached_dir_index(parent: str, mtime_ns: int, size: int, nlink: int) -> dict[str, str]:
+    """Cached _dir_index; the stat fields only form part of the cache key."""
+    return _dir_index(parent)
+
+
+def _dir_index(parent: str) -> dict[str, str]:
+    """Map lowercased entry names in a directory to their actual names."""
+    index: dict[str, str] = {}
+    for entry in Path(parent).iterdir():
+        index.setdefault(entry.name.lower(), entry.name)
+    return index
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -12,6 +13,12 @@ from ask.expand import expand_directory, expand_file, expand_url
 from ask.output import output
 from ask.types import Config
 
+# Opening marker of a file, dir or url block: <!-- file: path -->
+MARKER_OPEN_PATTERN = re.compile(r"<!-- (file|dir|url): ([^\s>]+) -->")
+
+# Upper bound on threads re-expanding blocks at once
+MAX_REFRESH_WORKERS = 8
+
 
 @dataclass
 class MarkerBlock:
@@ -38,6 +45,10 @@ class RefreshResult:
 def find_marker_blocks(content: str, include_urls: bool = False) -> list[MarkerBlock]:
     """Find all marker blocks in content.
 
+    Openers of every type are found in one scan. Each block runs to the first
+    matching closer, and blocks of one type never overlap, but file blocks
+    nested in a dir block are still reported.
+
     Args:
         content: Session content to search
         include_urls: Whether to include URL blocks
@@ -46,74 +57,47 @@ def find_marker_blocks(content: str, include_urls: bool = False) -> list[MarkerB
         List of MarkerBlock in order of appearance
     """
     blocks: list[MarkerBlock] = []
+    # End of the last block found per type, so same-type blocks don't overlap
+    last_end = {"file": 0, "dir": 0, "url": 0}
 
-    # Pattern for file markers: <!-- file: path -->...<!-- /file -->
-    file_pattern = re.compile(
-        r"(<!-- file: ([^\s>]+) -->)(.*?)(<!-- /file -->)",
-        re.DOTALL,
-    )
-
-    for match in file_pattern.finditer(content):
-        # Skip error markers
-        inner_content = match.group(3)
-        if inner_content.strip().startswith("❌"):
+    for match in MARKER_OPEN_PATTERN.finditer(content):
+        kind, reference = match.group(1), match.group(2)
+        if kind == "url" and not include_urls:
+            continue
+        if match.start() < last_end[kind]:
             continue
 
-        blocks.append(
-            MarkerBlock(
-                type="file",
-                reference=match.group(2),
-                start=match.start(),
-                end=match.end(),
-            )
-        )
+        is_recursive = False
+        if kind == "dir":
+            # Directory markers: <!-- dir: path/ --> or <!-- dir: path/**/ -->
+            if len(reference) > 4 and reference.endswith("/**/"):
+                reference, is_recursive = reference[:-4], True
+            elif len(reference) > 1 and reference.endswith("/"):
+                reference = reference[:-1]
+            else:
+                continue
 
-    # Pattern for directory markers: <!-- dir: path/ --> or <!-- dir: path/**/ -->
-    dir_pattern = re.compile(
-        r"(<!-- dir: ([^\s>]+?)(/\*\*/|/) -->)(.*?)(<!-- /dir -->)",
-        re.DOTALL,
-    )
+        closer = f"<!-- /{kind} -->"
+        close_start = content.find(closer, match.end())
+        if close_start == -1:
+            continue
+        block_end = close_start + len(closer)
+        last_end[kind] = block_end
 
-    for match in dir_pattern.finditer(content):
-        inner_content = match.group(4)
-        if inner_content.strip().startswith("❌"):
+        # Skip error markers
+        if content[match.end() : close_start].strip().startswith("❌"):
             continue
 
-        is_recursive = match.group(3) == "/**/"
         blocks.append(
             MarkerBlock(
-                type="dir",
-                reference=match.group(2),
+                type=kind,
+                reference=reference,
                 start=match.start(),
-                end=match.end(),
+                end=block_end,
                 is_recursive=is_recursive,
             )
         )
 
-    # Pattern for URL markers (only if requested)
-    if include_urls:
-        url_pattern = re.compile(
-            r"(<!-- url: ([^\s>]+) -->)(.*?)(<!-- /url -->)",
-            re.DOTALL,
-        )
-
-        for match in url_pattern.finditer(content):
-            inner_content = match.group(3)
-            if inner_content.strip().startswith("❌"):
-                continue
-
-            blocks.append(
-                MarkerBlock(
-                    type="url",
-                    reference=match.group(2),
-                    start=match.start(),
-                    end=match.end(),
-                )
-            )
-
-    # Sort by position
-    blocks.sort(key=lambda b: b.start)
-
     return blocks
 
 
@@ -177,13 +161,28 @@ def refresh_content(
     if not blocks:
         return content, result
 
-    # Process in reverse order to preserve positions
-    new_content = content
-    for block in reversed(blocks):
-        try:
-            expanded = refresh_block(block, config)
-            new_content = new_content[: block.start] + expanded + new_content[block.end :]
+    # Expand blocks concurrently; a block nested in another is only needed
+    # if the enclosing block keeps its old content
+    outcomes: dict[int, str | Exception] = {}
+    while pending := _pending_blocks(blocks, outcomes):
+        if len(pending) == 1:
+            outcomes[pending[0]] = _try_refresh_block(blocks[pending[0]], config)
+        else:
+            workers = min(MAX_REFRESH_WORKERS, len(pending))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                refreshed = executor.map(lambda i: _try_refresh_block(blocks[i], config), pending)
+                outcomes.update(zip(pending, refreshed, strict=True))
+
+    # Build the new content in one forward pass, joining once at the end
+    parts: list[str] = []
+    cursor = 0
+    for i, block in enumerate(blocks):
+        if block.start < cursor:
+            # Nested in a block that was already replaced (file inside dir)
+            continue
 
+        outcome = outcomes[i]
+        if isinstance(outcome, str):
             if block.type == "file":
                 result.files_refreshed += 1
                 result.details.append(block.reference)
@@ -194,30 +193,63 @@ def refresh_content(
             elif block.type == "url":
                 result.urls_refreshed += 1
                 result.details.append(block.reference)
-
-        except FileNotFoundError:
-            # Replace with error marker
-            error_marker = f"\n❌ Error: {block.reference} - File not found\n"
-            new_content = new_content[: block.start] + error_marker + new_content[block.end :]
+        elif isinstance(outcome, FileNotFoundError):
             result.errors.append(f"{block.reference}: File not found")
-
-        except ValueError as e:
-            if "Binary file" in str(e):
-                error_marker = f"\n❌ Error: {block.reference} - Binary file\n"
-                new_content = new_content[: block.start] + error_marker + new_content[block.end :]
-                result.errors.append(f"{block.reference}: Binary file")
-            else:
-                # Keep old content for other errors
-                result.errors.append(f"{block.reference}: {e}")
-
-        except Exception as e:
-            # For URLs and other failures, keep old content and log warning
-            if block.type == "url":
-                result.errors.append(f"{block.reference}: {e} (kept old content)")
-            else:
-                result.errors.append(f"{block.reference}: {e}")
-
-    return new_content, result
+        elif isinstance(outcome, ValueError) and "Binary file" in str(outcome):
+            result.errors.append(f"{block.reference}: Binary file")
+        elif block.type == "url" and not isinstance(outcome, ValueError):
+            # For URL failures, keep old content and log warning
+            result.errors.append(f"{block.reference}: {outcome} (kept old content)")
+        else:
+            # Keep old content for other errors
+            result.errors.append(f"{block.reference}: {outcome}")
+
+        replacement = _replacement_for(block, outcome)
+        if replacement is not None:
+            parts.append(content[cursor : block.start])
+            parts.append(replacement)
+            cursor = block.end
+
+    parts.append(content[cursor:])
+    return "".join(parts), result
+
+
+def _try_refresh_block(block: MarkerBlock, config: Config) -> str | Exception:
+    """Re-expand a block, returning the exception instead of raising it."""
+    try:
+        return refresh_block(block, config)
+    except Exception as e:
+        return e
+
+
+def _replacement_for(block: MarkerBlock, outcome: str | Exception) -> str | None:
+    """Text that replaces a block, or None to keep its old content."""
+    if isinstance(outcome, str):
+        return outcome
+    if isinstance(outcome, FileNotFoundError):
+        return f"\n❌ Error: {block.reference} - File not found\n"
+    if isinstance(outcome, ValueError) and "Binary file" in str(outcome):
+        return f"\n❌ Error: {block.reference} - Binary file\n"
+    return None
+
+
+def _pending_blocks(blocks: list[MarkerBlock], outcomes: dict[int, str | Exception]) -> list[int]:
+    """Indices of blocks the splice pass will reach that have no outcome yet.
+
+    Blocks without an outcome are assumed to be replaced, so blocks nested
+    in them are only returned once the enclosing block kept its content.
+    """
+    pending: list[int] = []
+    cursor = 0
+    for i, block in enumerate(blocks):
+        if block.start < cursor:
+            continue
+        if i not in outcomes:
+            pending.append(i)
+            cursor = block.end
+        elif _replacement_for(block, outcomes[i]) is not None:
+            cursor = block.end
+    return pending
 
 
 def refresh_session(
@@ -2,10 +2,17 @@
 
 from __future__ import annotations
 
-import re
 from dataclasses import dataclass
 from typing import Literal
 
+DIR_OPEN = "<!-- dir: "
+DIR_CLOSE = "<!-- /dir -->"
+URL_OPEN = "<!-- url: "
+URL_CLOSE = "<!-- /url -->"
+FILE_OPEN = "<!-- file: "
+FILE_CLOSE = "<!-- /file -->"
+MARKER_END = " -->"
+
 
 @dataclass
 class Region:
@@ -24,46 +31,52 @@ def find_excluded_regions(lines: list[str]) -> list[Region]:
     while i < len(lines):
         line = lines[i]
 
+        # Most lines are prose; only fences and markers need a closer look
+        if not line.startswith(("```", "<!-- ")):
+            i += 1
+            continue
+
         # Check for code fence
-        fence_match = re.match(r"^(`{3,})", line)
-        if fence_match:
-            fence = fence_match.group(1)
+        if line.startswith("```"):
+            fence_len = _backtick_run(line)
             start = i
             i += 1
             while i < len(lines):
-                closing_match = re.match(r"^(`{3,})\s*$", lines[i])
-                if closing_match and len(closing_match.group(1)) >= len(fence):
-                    break
+                closing = lines[i]
+                if closing.startswith("```"):
+                    run = _backtick_run(closing)
+                    if run >= fence_len and (run == len(closing) or closing[run:].isspace()):
+                        break
                 i += 1
             regions.append(Region(type="code-fence", start=start, end=i))
             i += 1
             continue
 
         # Check for expanded directory
-        if re.match(r"^<!-- dir: .+ -->$", line):
+        if _is_marker_open(line, DIR_OPEN):
             start = i
             i += 1
-            while i < len(lines) and not re.match(r"^<!-- /dir -->$", lines[i]):
+            while i < len(lines) and lines[i] != DIR_CLOSE:
                 i += 1
             regions.append(Region(type="expanded-dir", start=start, end=i))
             i += 1
             continue
 
         # Check for expanded URL
-        if re.match(r"^<!-- url: .+ -->$", line):
+        if _is_marker_open(line, URL_OPEN):
             start = i
             i += 1
-            while i < len(lines) and not re.match(r"^<!-- /url -->$", lines[i]):
+            while i < len(lines) and lines[i] != URL_CLOSE:
                 i += 1
             regions.append(Region(type="expanded-url", start=start, end=i))
             i += 1
             continue
 
         # Check for expanded file
-        if re.match(r"^<!-- file: .+ -->$", line):
+        if _is_marker_open(line, FILE_OPEN):
             start = i
             i += 1
-            while i < len(lines) and not re.match(r"^<!-- /file -->$", lines[i]):
+            while i < len(lines) and lines[i] != FILE_CLOSE:
                 i += 1
             regions.append(Region(type="expanded-file", start=start, end=i))
             i += 1
@@ -74,6 +87,35 @@ def find_excluded_regions(lines: list[str]) -> list[Region]:
     return regions
 
 
+def _backtick_run(line: str) -> int:
+    """Length of the run of backticks at the start of line."""
+    return len(line) - len(line.lstrip("`"))
+
+
+def _is_marker_open(line: str, prefix: str) -> bool:
+    """Check for an opening marker line like `<!-- dir: path -->`."""
+    return (
+        len(line) > len(prefix) + len(MARKER_END)
+        and line.startswith(prefix)
+        and line.endswith(MARKER_END)
+    )
+
+
 def is_in_excluded_region(line_index: int, regions: list[Region]) -> bool:
     """Check if a line index is within any excluded region."""
     return any(r.start <= line_index <= r.end for r in regions)
+
+
+def build_excluded_mask(lines: list[str], regions: list[Region]) -> bytearray:
+    """Mark each line index that falls inside an excluded region.
+
+    Lets callers test many lines in O(1) each instead of scanning every
+    region per line with is_in_excluded_region.
+    """
+    mask = bytearray(len(lines))
+    for region in regions:
+        # Unclosed regions run to the end of the file
+        end = min(region.end, len(lines) - 1)
+        if end >= region.start:
+            mask[region.start : end + 1] = b"\x01" * (end - region.start + 1)
+    return mask
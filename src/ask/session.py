@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
+import time
 from pathlib import Path
 from typing import TextIO
 
 from ask.config import load_config
 from ask.errors import AskError, ParseError
-from ask.expand import expand_references
-from ask.parser import parse_turns
+from ask.expand import REFERENCE_PATTERN, expand_references
+from ask.parser import find_input_marker, parse_turns
 from ask.types import Message, MessageContent, Session, Turn
 
 
@@ -17,16 +18,30 @@ def read_session(path: str) -> Session:
 
     Raises ParseError if the file cannot be read or parsed.
     """
+    return parse_session(read_session_text(path))
+
+
+def read_session_text(path: str) -> str:
+    """Read the raw text of a session file.
+
+    Raises ParseError if the file does not exist or cannot be read.
+    """
     file_path = Path(path)
 
     if not file_path.exists():
         raise ParseError(f"Session file not found: {path}")
 
     try:
-        content = file_path.read_text(encoding="utf-8")
+        return file_path.read_text(encoding="utf-8")
     except Exception as e:
         raise ParseError(f"Cannot read session file: {e}") from e
 
+
+def parse_session(content: str) -> Session:
+    """Parse session content into a Session.
+
+    Raises ParseError if there are no turns or no human turn.
+    """
     turns = parse_turns(content)
 
     if not turns:
@@ -86,27 +101,20 @@ def expand_session(path: str) -> tuple[bool, int]:
     Raises AskError if no references found to expand.
     """
     config = load_config()
-    session = read_session(path)
+    original = read_session_text(path)
+    session = parse_session(original)
 
     last_human = session.turns[session.last_human_turn_index]
 
     # Check for unexpanded references (without ZWS)
-    if "[[" not in last_human.content or "\u200b" in last_human.content.split("[[")[0]:
-        # No raw references found - check if there are any at all
-        import re
-
-        pattern = re.compile(r"\[\[([^\]\u200B]+)\]\]")
-        if not pattern.search(last_human.content):
-            raise AskError("No references to expand")
+    if not REFERENCE_PATTERN.search(last_human.content):
+        raise AskError("No references to expand")
 
     expanded_content, file_count = expand_references(last_human.content, config)
 
     if expanded_content == last_human.content:
         raise AskError("No references to expand")
 
-    file_path = Path(path)
-    original = file_path.read_text(encoding="utf-8")
-
     lines = original.split("\n")
     turn_header = f"# [{last_human.number}] Human"
 
@@ -132,11 +140,116 @@ def expand_session(path: str) -> tuple[bool, int]:
     new_lines.extend(lines[end_idx:])
 
     new_content = "\n".join(new_lines)
-    file_path.write_text(new_content, encoding="utf-8")
+    Path(path).write_text(new_content, encoding="utf-8")
 
     return True, file_count
 
 
+# Opening and closing markers of machine-written blocks in a human turn
+MACHINE_BLOCK_OPENINGS = ("<!-- ask:applied", "<!-- ask:check")
+MACHINE_BLOCK_CLOSINGS = ("<!-- /ask:applied -->", "<!-- /ask:check -->")
+
+
+def insert_block(content: str, block: str, after_machine_blocks: bool = False) -> str:
+    """Insert a machine block at the top of the current human turn.
+
+    The block goes right after the turn header (and any blank lines), before
+    any user text and the `_` marker. With after_machine_blocks, existing
+    ask:applied / ask:check blocks are skipped so the new block follows them.
+
+    Works on character offsets, so the content is never split into lines.
+    """
+    marker_info = find_input_marker(content)
+    if marker_info is None:
+        raise AskError(
+            "No input marker found",
+            "Add `_` on its own line in the current human turn",
+        )
+
+    _, marker_pos = marker_info
+
+    # Walk backwards line by line to the current human turn header
+    insert_pos: int | None = None
+    line_end = marker_pos - 1
+    while line_end >= 0:
+        line_start = content.rfind("\n", 0, line_end) + 1
+        line = content[line_start:line_end]
+        if line.startswith("# [") and "Human" in line:
+            insert_pos = line_end + 1
+            break
+        line_end = line_start - 1
+
+    if insert_pos is None:
+        raise AskError("Cannot find human turn for marker")
+
+    def next_line(pos: int) -> tuple[str, int]:
+        end = content.find("\n", pos)
+        return content[pos:end].strip(), end + 1
+
+    def skip_blank_lines(pos: int) -> int:
+        while pos < marker_pos:
+            line, after = next_line(pos)
+            if line:
+                break
+            pos = after
+        return pos
+
+    insert_pos = skip_blank_lines(insert_pos)
+
+    if after_machine_blocks:
+        while insert_pos < marker_pos:
+            line, _ = next_line(insert_pos)
+            if not line.startswith(MACHINE_BLOCK_OPENINGS):
+                break
+            # Skip through the closing marker
+            while insert_pos < marker_pos:
+                line, insert_pos = next_line(insert_pos)
+                if line in MACHINE_BLOCK_CLOSINGS:
+                    break
+            insert_pos = skip_blank_lines(insert_pos)
+
+    return f"{content[:insert_pos]}\n{block}\n\n{content[insert_pos:]}"
+
+
+class SessionEditor:
+    """Accumulates edits to a session file and writes them once.
+
+    Use as a context manager: the file is read on enter and written back on
+    exit if edits were made and no exception was raised. If the file changed
+    on disk in the meantime, the edits are replayed onto the fresh content so
+    user changes are never overwritten.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.content = ""
+        self._mtime_ns = 0
+        self._edits: list[tuple[str, bool]] = []
+
+    def __enter__(self) -> SessionEditor:
+        self.content = read_session_text(self.path)
+        self._mtime_ns = Path(self.path).stat().st_mtime_ns
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *_: object) -> None:
+        if exc_type is not None or not self._edits:
+            return
+
+        file_path = Path(self.path)
+        if file_path.stat().st_mtime_ns != self._mtime_ns:
+            content = file_path.read_text(encoding="utf-8")
+            for block, after_machine_blocks in self._edits:
+                content = insert_block(content, block, after_machine_blocks)
+            self.content = content
+
+        file_path.write_text(self.content, encoding="utf-8")
+
+    def insert_block(self, block: str, after_machine_blocks: bool = False) -> None:
+        """Insert a machine block at the top of the current human turn."""
+        self.content = insert_block(self.content, block, after_machine_blocks)
+        self._edits.append((block, after_machine_blocks))
+
+
 def turns_to_messages(turns: list[Turn]) -> list[Message]:
     """Convert turns to API message format."""
     messages: list[Message] = []
@@ -162,25 +275,36 @@ def turns_to_messages(turns: list[Turn]) -> list[Message]:
     return messages
 
 
+# Longest a streamed chunk may sit in the write buffer before reaching disk
+WRITER_FLUSH_SECONDS = 0.1
+
+
 class SessionWriter:
     """Writes AI response to session file incrementally."""
 
     def __init__(self, path: str, next_turn_number: int) -> None:
         self.path = Path(path)
         self.next_turn_number = next_turn_number
-        self.buffer: list[str] = []
         self._started = False
+        self._last_flush = 0.0
         self._file_handle: TextIO = self.path.open("a", encoding="utf-8")
 
     def write(self, text: str) -> None:
-        """Write a chunk of AI response."""
+        """Write a chunk of AI response.
+
+        Chunks collect in the file buffer and are flushed at most every
+        WRITER_FLUSH_SECONDS, so the file still grows live without a
+        write syscall per chunk.
+        """
         if not self._started:
             self._start_response()
             self._started = True
 
-        self.buffer.append(text)
         self._file_handle.write(text)
-        self._file_handle.flush()
+        now = time.monotonic()
+        if now - self._last_flush >= WRITER_FLUSH_SECONDS:
+            self._file_handle.flush()
+            self._last_flush = now
 
     def _start_response(self) -> None:
         """Write the AI turn header and opening wrapper."""
@@ -71,6 +71,44 @@ class InferenceProfile:
     model_id: str
 
 
+DEFAULT_EXCLUDE: tuple[str, ...] = (
+    ".git/**",
+    "node_modules/**",
+    "vendor/**",
+    "*.lock",
+    "uv.lock",
+    "bun.lockb",
+    "dist/**",
+    "build/**",
+    "out/**",
+    ".next/**",
+    ".nuxt/**",
+    "*.min.js",
+    "*.min.css",
+    "coverage/**",
+    "*.test.ts",
+    "*.spec.ts",
+    ".vscode/**",
+    ".DS_Store",
+    "Thumbs.db",
+    "tmp/**",
+    ".env",
+    ".env.*",
+    "*.pem",
+    "*.key",
+    ".gitignore",
+    ".dockerignore",
+    "LICENSE",
+    "session.md",
+    "__pycache__/**",
+    "*.pyc",
+    ".venv/**",
+    ".pytest_cache/**",
+    ".ruff_cache/**",
+    ".mypy_cache/**",
+)
+
+
 @dataclass
 class Config:
     """User configuration."""
@@ -85,42 +123,7 @@ class Config:
     @staticmethod
     def default_exclude() -> list[str]:
         """Return default exclude patterns."""
-        return [
-            ".git/**",
-            "node_modules/**",
-            "vendor/**",
-            "*.lock",
-            "uv.lock",
-            "bun.lockb",
-            "dist/**",
-            "build/**",
-            "out/**",
-            ".next/**",
-            ".nuxt/**",
-            "*.min.js",
-            "*.min.css",
-            "coverage/**",
-            "*.test.ts",
-            "*.spec.ts",
-            ".vscode/**",
-            ".DS_Store",
-            "Thumbs.db",
-            "tmp/**",
-            ".env",
-            ".env.*",
-            "*.pem",
-            "*.key",
-            ".gitignore",
-            ".dockerignore",
-            "LICENSE",
-            "session.md",
-            "__pycache__/**",
-            "*.pyc",
-            ".venv/**",
-            ".pytest_cache/**",
-            ".ruff_cache/**",
-            ".mypy_cache/**",
-        ]
+        return list(DEFAULT_EXCLUDE)
 
 
 @dataclass
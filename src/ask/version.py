@@ -1,4 +1,8 @@
-"""Version information for ask."""
+"""Version information for ask.
+
+Plain constants, substituted by CI at build time, so showing the version
+never reads package metadata from site-packages.
+"""
 
 from __future__ import annotations
 
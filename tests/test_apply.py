@@ -2,6 +2,7 @@
 
 from collections.abc import Callable
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -12,6 +13,7 @@ from ask.apply import (
     apply_session,
     format_applied_block,
     insert_applied_block,
+    print_apply_result,
 )
 from ask.errors import AskError
 from ask.workspace import find_workspace, resolve_path
@@ -81,6 +83,25 @@ x = 1
     assert "x = 1" in target_file.read_text()
 
 
+def test_write_files_create_each_directory_once(
+    make_session: Callable[..., Path], tmp_path: Path
+) -> None:
+    """Files sharing a new parent directory trigger a single mkdir."""
+    (tmp_path / "pkg").mkdir()
+    target_dir = tmp_path / "pkg" / "sub"
+    blocks = [
+        f"<!-- file: {target_dir / name} -->\n```python\nx = 1\n```\n<!-- /file -->"
+        for name in ("a.py", "b.py", "c.py")
+    ]
+    session_path = make_session(ai_content="\n\n".join(blocks))
+
+    with patch.object(Path, "mkdir", autospec=True, side_effect=Path.mkdir) as mkdir:
+        result = apply_session(str(session_path))
+
+    assert [fr.action for fr in result.file_results] == ["created"] * 3
+    assert [call.args[0] for call in mkdir.call_args_list] == [target_dir]
+
+
 def test_write_file_updates_existing(make_session: Callable[..., Path], tmp_path: Path) -> None:
     """Writing to existing file reports 'updated'."""
     existing = tmp_path / "existing.py"
@@ -102,6 +123,28 @@ new content
     assert "new content" in existing.read_text()
 
 
+def test_write_file_through_dangling_symlink(
+    make_session: Callable[..., Path], tmp_path: Path
+) -> None:
+    """A symlink whose target is missing gets the target created."""
+    target = tmp_path / "target.py"
+    link = tmp_path / "link.py"
+    link.symlink_to(target)
+
+    ai_content = f"""<!-- file: {link} -->
+```python
+new content
+```
+<!-- /file -->"""
+    session_path = make_session(ai_content=ai_content)
+
+    result = apply_session(str(session_path))
+
+    assert result.file_results[0].action == "created"
+    assert result.file_results[0].error is None
+    assert target.read_text() == "new content"
+
+
 def test_apply_no_ai_turn(make_session: Callable[..., Path]) -> None:
     """Apply with no AI turn raises error."""
     session_path = make_session(include_ai_turn=False)
@@ -322,3 +365,19 @@ echo "should not run"
     assert len(result.command_results) == 1
     assert result.command_results[0].status == "FAIL"
     assert result.status == "PARTIAL"
+
+
+def test_print_apply_result_dry_run(capsys: pytest.CaptureFixture[str]) -> None:
+    """Dry run summary counts files and commands."""
+    result = ApplyResult(
+        file_results=[FileResult(path="a.py", action="created", size=10)],
+        command_results=[
+            CommandResult(command="make", status="OK"),
+            CommandResult(command="make test", status="OK"),
+        ],
+        status="OK",
+    )
+
+    print_apply_result(result, dry_run=True)
+
+    assert "Would apply: 1 file, 2 commands" in capsys.readouterr().out
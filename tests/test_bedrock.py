@@ -1,9 +1,16 @@
 """Tests for bedrock module."""
 
+from typing import Any
+from unittest.mock import patch
+
 from ask.bedrock import (
+    ModelVersion,
+    _iter_inference_profiles,  # pyright: ignore[reportPrivateUsage]
     _negate_date,  # pyright: ignore[reportPrivateUsage]
     _parse_model_version,  # pyright: ignore[reportPrivateUsage]
+    stream_completion,
 )
+from ask.types import Config, StreamChunk, StreamEnd
 
 
 class TestParseModelVersion:
@@ -14,54 +21,54 @@ class TestParseModelVersion:
         model_id = "anthropic.claude-opus-4-5-20251101-v1:0"
         result = _parse_model_version(model_id)
 
-        assert result["major"] == 4
-        assert result["minor"] == 5
-        assert result["date"] == "20251101"
+        assert result.major == 4
+        assert result.minor == 5
+        assert result.date == "20251101"
 
     def test_parse_opus_4(self) -> None:
         """Parse claude-opus-4 model ID (no minor version)."""
         model_id = "anthropic.claude-opus-4-20250514-v1:0"
         result = _parse_model_version(model_id)
 
-        assert result["major"] == 4
-        assert result["minor"] == 0
-        assert result["date"] == "20250514"
+        assert result.major == 4
+        assert result.minor == 0
+        assert result.date == "20250514"
 
     def test_parse_opus_4_1(self) -> None:
         """Parse claude-opus-4-1 model ID."""
         model_id = "anthropic.claude-opus-4-1-20250805-v1:0"
         result = _parse_model_version(model_id)
 
-        assert result["major"] == 4
-        assert result["minor"] == 1
-        assert result["date"] == "20250805"
+        assert result.major == 4
+        assert result.minor == 1
+        assert result.date == "20250805"
 
     def test_parse_claude_3_opus(self) -> None:
         """Parse older claude-3-opus model ID."""
         model_id = "anthropic.claude-3-opus-20240229-v1:0"
         result = _parse_model_version(model_id)
 
-        assert result["major"] == 3
-        assert result["minor"] == 0
-        assert result["date"] == "20240229"
+        assert result.major == 3
+        assert result.minor == 0
+        assert result.date == "20240229"
 
     def test_parse_sonnet_3_5(self) -> None:
         """Parse claude-3-5-sonnet model ID."""
         model_id = "anthropic.claude-3-5-sonnet-20241022-v2:0"
         result = _parse_model_version(model_id)
 
-        assert result["major"] == 3
-        assert result["minor"] == 5
-        assert result["date"] == "20241022"
+        assert result.major == 3
+        assert result.minor == 5
+        assert result.date == "20241022"
 
     def test_parse_haiku_3_5(self) -> None:
         """Parse claude-3-5-haiku model ID."""
         model_id = "anthropic.claude-3-5-haiku-20241022-v1:0"
         result = _parse_model_version(model_id)
 
-        assert result["major"] == 3
-        assert result["minor"] == 5
-        assert result["date"] == "20241022"
+        assert result.major == 3
+        assert result.minor == 5
+        assert result.date == "20241022"
 
     def test_date_not_included_as_minor_version(self) -> None:
         """Regression test: date should not be parsed as minor version.
@@ -77,10 +84,10 @@ class TestParseModelVersion:
         result_4_5 = _parse_model_version(model_id_4_5)
 
         # 4.5 should have higher minor than 4.0
-        assert result_4_5["minor"] > result_4["minor"]
+        assert result_4_5.minor > result_4.minor
         # And both should have reasonable minor versions (not dates)
-        assert result_4["minor"] < 100  # Not a date
-        assert result_4_5["minor"] < 100  # Not a date
+        assert result_4.minor < 100  # Not a date
+        assert result_4_5.minor < 100  # Not a date
 
 
 class TestNegateDateForSort:
@@ -112,26 +119,128 @@ class TestNegateDateForSort:
         3. Minor version (descending)
         4. Date (descending - newer first)
         """
-        # Simulate the version dicts from parsing
+        # Simulate the versions from parsing
         versions = [
-            {"major": 4, "minor": 0, "date": "20250514"},  # opus-4
-            {"major": 4, "minor": 5, "date": "20251101"},  # opus-4-5
-            {"major": 4, "minor": 1, "date": "20250805"},  # opus-4-1
-            {"major": 3, "minor": 0, "date": "20240229"},  # claude-3-opus
+            ModelVersion(major=4, minor=0, date="20250514"),  # opus-4
+            ModelVersion(major=4, minor=5, date="20251101"),  # opus-4-5
+            ModelVersion(major=4, minor=1, date="20250805"),  # opus-4-1
+            ModelVersion(major=3, minor=0, date="20240229"),  # claude-3-opus
         ]
 
         # Sort using same key as find_profile
-        def sort_key(v: dict[str, int | str]) -> tuple[int, int, str]:
-            return (
-                -int(v["major"]),
-                -int(v["minor"]),
-                _negate_date(str(v["date"])),
-            )
+        def sort_key(v: ModelVersion) -> tuple[int, int, str]:
+            return (-v.major, -v.minor, _negate_date(v.date))
 
         sorted_versions = sorted(versions, key=sort_key)
 
         # Expected order: 4.5, 4.1, 4.0, 3.0
-        assert sorted_versions[0]["minor"] == 5  # opus-4-5 first
-        assert sorted_versions[1]["minor"] == 1  # opus-4-1 second
-        assert sorted_versions[2]["major"] == 4 and sorted_versions[2]["minor"] == 0  # opus-4
-        assert sorted_versions[3]["major"] == 3  # claude-3-opus last
+        assert sorted_versions[0].minor == 5  # opus-4-5 first
+        assert sorted_versions[1].minor == 1  # opus-4-1 second
+        assert sorted_versions[2].major == 4 and sorted_versions[2].minor == 0  # opus-4
+        assert sorted_versions[3].major == 3  # claude-3-opus last
+
+
+class FakeBedrockClient:
+    """Bedrock client stub returning canned pages of inference profiles."""
+
+    def __init__(self, pages: list[dict[str, Any]]) -> None:
+        self.pages = pages
+        self.calls: list[dict[str, Any]] = []
+
+    def list_inference_profiles(self, **kwargs: Any) -> dict[str, Any]:
+        self.calls.append(kwargs)
+        return self.pages[len(self.calls) - 1]
+
+
+class TestIterInferenceProfiles:
+    """Tests for _iter_inference_profiles pagination."""
+
+    def test_follows_next_token(self) -> None:
+        """Profiles from every page are yielded in order."""
+        client = FakeBedrockClient(
+            [
+                {"inferenceProfileSummaries": [{"id": 1}], "nextToken": "page-2"},
+                {"inferenceProfileSummaries": [{"id": 2}, {"id": 3}]},
+            ]
+        )
+
+        profiles = list(_iter_inference_profiles(client))
+
+        assert [p["id"] for p in profiles] == [1, 2, 3]
+        assert client.calls[1]["nextToken"] == "page-2"
+
+    def test_fetches_pages_lazily(self) -> None:
+        """Later pages are not requested until the consumer needs them."""
+        client = FakeBedrockClient(
+            [
+                {"inferenceProfileSummaries": [{"id": 1}], "nextToken": "page-2"},
+                {"inferenceProfileSummaries": [{"id": 2}]},
+            ]
+        )
+
+        first = next(_iter_inference_profiles(client))
+
+        assert first["id"] == 1
+        assert len(client.calls) == 1
+
+
+class FakeRuntimeClient:
+    """Bedrock runtime client stub returning a canned event stream."""
+
+    def __init__(self, events: list[dict[str, Any]]) -> None:
+        self.events = events
+
+    def converse_stream(self, **kwargs: Any) -> dict[str, Any]:
+        return {"stream": self.events}
+
+
+def _delta(text: str) -> dict[str, Any]:
+    return {"contentBlockDelta": {"delta": {"text": text}}}
+
+
+class TestStreamCompletion:
+    """Tests for stream_completion chunking."""
+
+    def test_coalesces_small_deltas(self) -> None:
+        """Small deltas arriving together are yielded as one chunk."""
+        client = FakeRuntimeClient([_delta("Hello"), _delta(", "), _delta("world")])
+
+        with (
+            patch("ask.bedrock.load_config", return_value=Config()),
+            patch("ask.bedrock._get_boto3_client", return_value=client),
+            patch("ask.bedrock.STREAM_FLUSH_SECONDS", 60.0),
+        ):
+            events = list(stream_completion("arn", [], 100))
+
+        chunks = [e for e in events if isinstance(e, StreamChunk)]
+        assert [c.text for c in chunks] == ["Hello, world"]
+        assert isinstance(events[-1], StreamEnd)
+
+    def test_flushes_at_size_threshold(self) -> None:
+        """Pending text is yielded once it reaches the size threshold."""
+        client = FakeRuntimeClient([_delta("abcd"), _delta("efgh"), _delta("ij")])
+
+        with (
+            patch("ask.bedrock.load_config", return_value=Config()),
+            patch("ask.bedrock._get_boto3_client", return_value=client),
+            patch("ask.bedrock.STREAM_FLUSH_CHARS", 8),
+            patch("ask.bedrock.STREAM_FLUSH_SECONDS", 60.0),
+        ):
+            events = list(stream_completion("arn", [], 100))
+
+        chunks = [e for e in events if isinstance(e, StreamChunk)]
+        assert [c.text for c in chunks] == ["abcdefgh", "ij"]
+
+    def test_token_estimate_uses_running_char_count(self) -> None:
+        """Token estimate is not inflated by per-delta rounding."""
+        client = FakeRuntimeClient([_delta("a")] * 8)
+
+        with (
+            patch("ask.bedrock.load_config", return_value=Config()),
+            patch("ask.bedrock._get_boto3_client", return_value=client),
+        ):
+            events = list(stream_completion("arn", [], 100))
+
+        end = events[-1]
+        assert isinstance(end, StreamEnd)
+        assert end.total_tokens == 2
@@ -0,0 +1,91 @@
+"""Tests for chat streaming."""
+
+import signal
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from ask.chat import chat_session
+from ask.types import InferenceProfile, StreamChunk, StreamEnd, StreamEvent
+
+PROFILE = InferenceProfile(
+    arn="arn:aws:bedrock:us-west-2:123:inference-profile/us.anthropic.claude-sonnet",
+    model_id="anthropic.claude-sonnet-4-20250514-v1:0",
+)
+
+
+@pytest.fixture
+def session(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Session with one human turn and no user config."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    path = tmp_path / "session.md"
+    path.write_text("# [1] Human\n\nHello\n", encoding="utf-8")
+    return path
+
+
+def _run(session: Path, events: Iterator[StreamEvent]) -> None:
+    def fake_stream(*args: Any, **kwargs: Any) -> Iterator[StreamEvent]:
+        return events
+
+    with (
+        patch("ask.chat.find_profile", return_value=PROFILE),
+        patch("ask.chat.stream_completion", side_effect=fake_stream),
+    ):
+        chat_session(str(session))
+
+
+def test_chat_session_writes_response(session: Path) -> None:
+    """Streamed text is appended as the next AI turn."""
+    _run(session, iter([StreamChunk(text="Hi there", tokens=2), StreamEnd(total_tokens=2)]))
+
+    content = session.read_text(encoding="utf-8")
+    assert "# [2] AI" in content
+    assert "Hi there" in content
+
+
+def test_chat_session_restores_sigint_handler(session: Path) -> None:
+    """The previous SIGINT handler is back in place after streaming."""
+    before = signal.getsignal(signal.SIGINT)
+
+    _run(session, iter([StreamChunk(text="Hi", tokens=1), StreamEnd(total_tokens=1)]))
+
+    assert signal.getsignal(signal.SIGINT) is before
+
+
+def test_chat_session_stops_on_interrupt(session: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """SIGINT during streaming stops before the next event."""
+
+    def events() -> Iterator[StreamEvent]:
+        yield StreamChunk(text="first", tokens=1)
+        signal.raise_signal(signal.SIGINT)
+        yield StreamChunk(text="second", tokens=2)
+        yield StreamEnd(total_tokens=2)
+
+    _run(session, events())
+
+    content = session.read_text(encoding="utf-8")
+    assert "first" in content
+    assert "second" not in content
+    assert "Interrupted" in capsys.readouterr().out
+
+
+def test_chat_session_outside_main_thread(session: Path) -> None:
+    """Streaming from a worker thread skips the SIGINT handler."""
+    errors: list[BaseException] = []
+
+    def target() -> None:
+        try:
+            _run(session, iter([StreamChunk(text="Hi", tokens=1), StreamEnd(total_tokens=1)]))
+        except BaseException as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+
+    assert errors == []
+    assert "Hi" in session.read_text(encoding="utf-8")
@@ -1,6 +1,12 @@
 """Tests for check logic."""
 
+import dataclasses
 import json
+import os
+import signal
+import subprocess
+import threading
+import time
 from collections.abc import Callable
 from pathlib import Path
 from typing import Any
@@ -9,13 +15,18 @@ from unittest.mock import patch
 import pytest
 
 from ask.check import (
+    CheckDef,
     CheckResult,
     CheckRunResult,
     extract_summary,
     format_check_block,
     insert_check_block,
     load_checks,
+    print_check_result,
+    run_checks,
+    run_shell,
     strip_ansi_codes,
+    truncate_output,
 )
 from ask.errors import AskError
 
@@ -93,6 +104,18 @@ def test_load_checks_with_fix_command(tmp_path: Path) -> None:
     assert checks[0].fix_command == "lint fix"
 
 
+def test_load_checks_returns_immutable_cached_checks(tmp_path: Path) -> None:
+    """Cached check definitions can't be changed by one caller for the next."""
+    with patch("ask.check.get_checks_path", return_value=tmp_path / "checks.json"):
+        checks = load_checks()
+        checks.pop()
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            checks[0].command = "rm -rf /"  # type: ignore[misc]
+
+        assert len(load_checks()) == len(checks) + 1
+
+
 def test_load_checks_invalid_json(tmp_path: Path) -> None:
     """Load checks raises error on invalid JSON."""
     checks_path = tmp_path / ".ask" / "checks.json"
@@ -149,6 +172,22 @@ def test_strip_ansi_codes_no_codes() -> None:
     assert result == input_text
 
 
+def test_truncate_output_short_unchanged() -> None:
+    """Output under the limit is returned as-is."""
+    assert truncate_output("short output") == "short output"
+
+
+def test_truncate_output_keeps_head_and_tail() -> None:
+    """Long output keeps head and tail with a truncation note."""
+    text = "H" * 40000 + "M" * 1000 + "T" * 40000
+    result = truncate_output(text)
+
+    assert result.startswith("H" * 32768)
+    assert result.endswith("T" * 32768)
+    assert "[truncated 15464 characters]" in result
+    assert len(result) < len(text)
+
+
 def test_extract_summary_pytest_passed() -> None:
     """Extract pytest passed summary."""
     output = "===== 12 passed in 0.5s ====="
@@ -371,3 +410,118 @@ def test_insert_check_block_no_marker(make_session: Callable[..., Path]) -> None
         insert_check_block(str(session_path), check_block)
 
     assert "No input marker" in str(exc_info.value)
+
+
+def test_run_checks_preserves_order(make_session: Callable[..., Path]) -> None:
+    """Concurrent checks report results in definition order."""
+    session_path = make_session()
+    checks = [
+        CheckDef(id="slow", name="Slow", command="sleep 0.2 && exit 1"),
+        CheckDef(id="fast", name="Fast", command="true"),
+    ]
+
+    with patch("ask.check.load_checks", return_value=checks):
+        result = run_checks(str(session_path))
+
+    assert [r.id for r in result.results] == ["slow", "fast"]
+    assert [r.status for r in result.results] == ["FAIL", "PASS"]
+    assert result.status == "FAIL"
+
+
+def test_run_checks_merges_stderr(make_session: Callable[..., Path]) -> None:
+    """Failed check output includes both stdout and stderr."""
+    session_path = make_session()
+    checks = [CheckDef(id="noisy", name="Noisy", command="echo out; echo err >&2; exit 1")]
+
+    with patch("ask.check.load_checks", return_value=checks):
+        result = run_checks(str(session_path))
+
+    output = result.results[0].output or ""
+    assert "out" in output
+    assert "err" in output
+
+
+def test_run_shell_timeout_kills_children(tmp_path: Path) -> None:
+    """Timeout kills the shell's children instead of waiting on them."""
+    start = time.monotonic()
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_shell("sleep 5; echo done", tmp_path, timeout=0.2)
+
+    assert time.monotonic() - start < 3
+
+
+def _interrupt_main_thread_after(delay: float) -> threading.Timer:
+    """Deliver SIGINT to the main thread after delay, like a terminal Ctrl-C."""
+    main_id = threading.main_thread().ident
+    assert main_id is not None
+    timer = threading.Timer(delay, signal.pthread_kill, args=(main_id, signal.SIGINT))
+    timer.start()
+    return timer
+
+
+def _wait_for_exit(pid: int, timeout: float = 3) -> bool:
+    """Poll until pid no longer exists."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_run_shell_interrupt_kills_process_group(tmp_path: Path) -> None:
+    """Ctrl-C while a command runs kills the command's whole process group."""
+    pid_file = tmp_path / "pid"
+    timer = _interrupt_main_thread_after(0.3)
+
+    with pytest.raises(KeyboardInterrupt):
+        run_shell(f"sleep 30 & echo $! > {pid_file}; wait", tmp_path, timeout=30)
+    timer.join()
+
+    assert _wait_for_exit(int(pid_file.read_text()))
+
+
+def test_run_checks_interrupt_kills_running_checks(
+    make_session: Callable[..., Path], tmp_path: Path
+) -> None:
+    """Ctrl-C during checks returns promptly and kills every running check."""
+    session_path = make_session()
+    pid_files = [tmp_path / "a.pid", tmp_path / "b.pid"]
+    checks = [
+        CheckDef(id=f.stem, name=f.stem, command=f"sleep 30 & echo $! > {f}; wait")
+        for f in pid_files
+    ]
+    start = time.monotonic()
+    timer = _interrupt_main_thread_after(0.5)
+
+    with (
+        patch("ask.check.load_checks", return_value=checks),
+        pytest.raises(KeyboardInterrupt),
+    ):
+        run_checks(str(session_path))
+    timer.join()
+
+    assert time.monotonic() - start < 5
+    for pid_file in pid_files:
+        assert _wait_for_exit(int(pid_file.read_text()))
+
+
+def test_print_check_result_counts_failures(capsys: pytest.CaptureFixture[str]) -> None:
+    """Summary line counts every non-passing check."""
+    result = CheckRunResult(
+        results=[
+            CheckResult(id="ruff", name="Ruff", status="PASS", summary=""),
+            CheckResult(id="pyright", name="Pyright", status="FAIL", summary="2 errors"),
+            CheckResult(id="pytest", name="Pytest", status="TIMEOUT", summary=""),
+        ],
+        status="FAIL",
+    )
+
+    print_check_result(result)
+
+    captured = capsys.readouterr()
+    assert "2 checks failed" in captured.err
+    assert "(timeout)" in captured.out
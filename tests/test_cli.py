@@ -1,10 +1,14 @@
 """Tests for CLI using Typer's CliRunner."""
 
+import sys
 from pathlib import Path
+from unittest.mock import patch
 
+import pytest
 from typer.testing import CliRunner
 
-from ask.cli import app
+from ask.check import CheckResult, CheckRunResult
+from ask.cli import _single_command_app, app, main  # pyright: ignore[reportPrivateUsage]
 from ask.version import VERSION
 
 runner = CliRunner()
@@ -145,6 +149,13 @@ class TestChatErrors:
         assert "session.md" in result.output
         assert "init" in result.output
 
+    def test_chat_directory_session(self, tmp_path: Path) -> None:
+        """chat rejects a directory passed as the session file."""
+        result = runner.invoke(app, ["chat", str(tmp_path)])
+
+        assert result.exit_code == 1
+        assert "File not found" in result.output
+
 
 class TestApplyErrors:
     """Tests for apply command error handling."""
@@ -169,6 +180,22 @@ class TestCheckErrors:
         assert result.exit_code == 1
         assert "not found" in result.output.lower() or "File not found" in result.output
 
+    def test_check_failure_exits_without_extra_error(self, tmp_path: Path) -> None:
+        """Failed checks exit 1 without a spurious error line for the exit itself."""
+        session = tmp_path / "session.md"
+        session.write_text("# [1] Human\n\nHi\n\n_\n")
+        failed = CheckRunResult(
+            results=[CheckResult(id="ruff", name="Ruff", status="FAIL", summary="")],
+            status="FAIL",
+        )
+
+        with patch("ask.check.run_checks", return_value=failed):
+            result = runner.invoke(app, ["check", str(session)])
+
+        assert result.exit_code == 1
+        assert "1 check failed" in result.output
+        assert not result.output.rstrip().endswith(" 1")
+
 
 class TestRefreshErrors:
     """Tests for refresh command error handling."""
@@ -214,6 +241,26 @@ class TestCfg:
         assert result.exit_code == 1
         assert "Missing value" in result.output
 
+    def test_cfg_missing_value_prints_only_usage(self, tmp_path: Path, monkeypatch: object) -> None:
+        """The usage hint is the whole error output, with no stray exit code."""
+        monkeypatch.setenv("HOME", str(tmp_path))  # type: ignore[attr-defined]
+
+        result = runner.invoke(app, ["cfg", "model"])
+
+        lines = [line for line in result.output.splitlines() if line.strip()]
+        assert len(lines) == 2
+        assert "Missing value for 'model'" in lines[0]
+        assert lines[1] == "Usage: ask cfg model <value>"
+
+    def test_cfg_invalid_value_reports_error(self, tmp_path: Path, monkeypatch: object) -> None:
+        """Config errors are reported once and exit with status 1."""
+        monkeypatch.setenv("HOME", str(tmp_path))  # type: ignore[attr-defined]
+
+        result = runner.invoke(app, ["cfg", "temperature", "hot"])
+
+        assert result.exit_code == 1
+        assert result.output.count("✗") == 1
+
 
 class TestDefaultCommand:
     """Tests for default command behavior."""
@@ -227,3 +274,52 @@ class TestDefaultCommand:
 
         assert result.exit_code == 1
         assert "session.md" in result.output
+
+
+class TestMain:
+    """Tests for the main() entry point dispatch."""
+
+    def test_single_command_app_known_name(self) -> None:
+        """Subcommand names map to a one-command app."""
+        single = _single_command_app("apply")
+        assert single is not None
+        assert len(single.registered_commands) == 1
+
+    def test_single_command_app_unknown_name(self) -> None:
+        """Session paths and options fall through to the full app."""
+        assert _single_command_app("session.md") is None
+        assert _single_command_app("--help") is None
+
+    def test_version_fast_path(
+        self, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """--version prints without dispatching through Typer."""
+        monkeypatch.setattr(sys, "argv", ["ask", "--version"])
+        main()
+        assert VERSION in capsys.readouterr().out
+
+    def test_single_command_help(
+        self, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Subcommand help is rendered from the single-command app."""
+        monkeypatch.setattr(sys, "argv", ["ask", "apply", "--help"])
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+        assert exc_info.value.code == 0
+        out = capsys.readouterr().out
+        assert "ask apply" in out
+        assert "--dry-run" in out
+
+    def test_no_args_runs_chat(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Bare `ask` goes straight to chat on session.md."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(sys, "argv", ["ask"])
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+        assert exc_info.value.code == 1
+        assert "No session.md found" in capsys.readouterr().err
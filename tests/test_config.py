@@ -0,0 +1,73 @@
+"""Tests for configuration management."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from ask.config import (
+    _strip_json_comments,  # pyright: ignore[reportPrivateUsage]
+    load_config,
+    save_config,
+)
+from ask.types import Config
+
+
+@pytest.fixture
+def home(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point the config directory at a temporary home."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return tmp_path
+
+
+def test_load_config_missing_returns_defaults(home: Path) -> None:
+    """Missing config file yields default config."""
+    assert load_config() == Config()
+
+
+def test_load_config_sees_updates(home: Path) -> None:
+    """Cached config is invalidated when the file changes."""
+    save_config(Config(model="opus"))
+    assert load_config().model == "opus"
+
+    save_config(Config(model="haiku", temperature=0.5))
+    config = load_config()
+    assert config.model == "haiku"
+    assert config.temperature == 0.5
+
+
+def test_load_config_returns_copy(home: Path) -> None:
+    """Mutating a loaded config does not affect later loads."""
+    save_config(Config(model="opus"))
+
+    config = load_config()
+    config.model = "haiku"
+    assert config.exclude is not None
+    config.exclude.append("extra/**")
+
+    reloaded = load_config()
+    assert reloaded.model == "opus"
+    assert reloaded.exclude is not None
+    assert "extra/**" not in reloaded.exclude
+
+
+def test_strip_json_comments_keeps_strings() -> None:
+    """Comment markers inside strings, including after escaped quotes, survive."""
+    text = '{\n  // note\n  "a": "x//y", // trailing\n  "b": "q\\"//" /* block\n */\n}'
+    assert json.loads(_strip_json_comments(text)) == {"a": "x//y", "b": 'q"//'}
+
+
+def test_saved_config_round_trips(home: Path) -> None:
+    """Commented config written by save_config parses back unchanged."""
+    config = Config(
+        model="opus", temperature=0.3, max_tokens=1000, region="us-east-1", exclude=["*.log"]
+    )
+    save_config(config)
+    assert load_config() == config
+
+
+def test_saved_config_escapes_values(home: Path) -> None:
+    """Exclude patterns with quotes and backslashes survive a save."""
+    config = Config(exclude=['say "hi"/**', "C:\\tmp\\*.log"])
+    save_config(config)
+    assert load_config().exclude == config.exclude
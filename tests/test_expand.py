@@ -2,8 +2,16 @@
 
 import tempfile
 from pathlib import Path
-
-from ask.expand import expand_references, natural_sort_key
+from typing import Any
+from unittest.mock import patch
+
+import ask.expand as expand_module
+from ask.expand import (
+    BINARY_SNIFF_BYTES,
+    MAX_FILTER_CHARS,
+    expand_references,
+    natural_sort_key,
+)
 from ask.types import Config
 
 
@@ -180,6 +188,21 @@ def test_expand_directory_uses_natural_sort() -> None:
         assert pos_1 < pos_2 < pos_10 < pos_readme
 
 
+def test_expand_directory_many_files_keeps_order(tmp_path: Path) -> None:
+    """Order holds with more files than expansion workers; unreadable files are skipped."""
+    for i in range(40):
+        (tmp_path / f"{i}-file.txt").write_text(f"content-{i}-end")
+    (tmp_path / "5-binary.bin").write_bytes(b"\x00\x01")
+
+    config = Config(filter=False, exclude=[])
+    expanded, file_count = expand_references(f"[[{tmp_path}/]]", config)
+
+    assert file_count == 40
+    positions = [expanded.find(f"content-{i}-end") for i in range(40)]
+    assert positions == sorted(positions)
+    assert "5-binary.bin" not in expanded
+
+
 def test_zero_width_space_escaping_prevents_re_expansion() -> None:
     """Zero-width space escaping prevents re-expansion."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -212,6 +235,33 @@ def test_expand_handles_binary_file_error() -> None:
         assert "Binary file" in expanded
 
 
+def test_expand_rejects_large_binary_without_reading_it(tmp_path: Path) -> None:
+    """Only the sniffed prefix of a binary file is read."""
+    binary_file = tmp_path / "weights.bin"
+    binary_file.write_bytes(b"\x00" + b"\xff" * 1_000_000)
+    bytes_read: list[int] = []
+    real_open = Path.open
+
+    def counting_open(path: Path, *args: Any, **kwargs: Any) -> Any:
+        f = real_open(path, *args, **kwargs)
+        real_read = f.read
+
+        def read(size: int = -1) -> Any:
+            data = real_read(size)
+            bytes_read.append(len(data))
+            return data
+
+        f.read = read
+        return f
+
+    with patch.object(Path, "open", counting_open):
+        expanded, file_count = expand_references(f"[[{binary_file}]]", Config())
+
+    assert file_count == 0
+    assert "Binary file" in expanded
+    assert sum(bytes_read) <= BINARY_SNIFF_BYTES
+
+
 def test_expand_handles_missing_file_error() -> None:
     """Missing files should produce an error."""
     content = "[[/nonexistent/path/file.py]]"
@@ -221,3 +271,65 @@ def test_expand_handles_missing_file_error() -> None:
 
     assert file_count == 0
     assert "❌ Error:" in expanded
+
+
+def test_expand_multiple_references_in_place(tmp_path: Path) -> None:
+    """Each reference is replaced where it appears, errors included."""
+    first = tmp_path / "first.py"
+    first.write_text("FIRST")
+    second = tmp_path / "second.py"
+    second.write_text("SECOND")
+    content = f"a [[{first}]] b [[/nonexistent/file.py]] c [[{second}]] d"
+
+    expanded, file_count = expand_references(content, Config(filter=False))
+
+    assert file_count == 2
+    order = ["a ", "FIRST", " b ", "❌ Error: /nonexistent/file.py", " c ", "SECOND", " d"]
+    positions = [expanded.find(part) for part in order]
+    assert -1 not in positions
+    assert positions == sorted(positions)
+
+
+def test_expand_file_normalizes_newlines(tmp_path: Path) -> None:
+    """CRLF and CR line endings are expanded as plain newlines."""
+    path = tmp_path / "crlf.txt"
+    path.write_bytes(b"one\r\ntwo\rthree\n")
+
+    expanded, file_count = expand_references(f"[[{path}]]", Config(filter=False))
+
+    assert file_count == 1
+    assert "one\ntwo\nthree\n" in expanded
+    assert "\r" not in expanded
+
+
+def test_expand_file_skips_filter_for_large_files(tmp_path: Path) -> None:
+    """Files above MAX_FILTER_CHARS are expanded without comment filtering."""
+    path = tmp_path / "big.py"
+    path.write_text("# comment\n" + "x = 1\n" * (MAX_FILTER_CHARS // 6))
+
+    expanded, file_count = expand_references(f"[[{path}]]", Config(filter=True))
+
+    assert file_count == 1
+    assert "# comment" in expanded
+
+
+def test_expand_directories_do_not_nest_thread_pools(tmp_path: Path) -> None:
+    """With several references, directories are read inside the outer pool only."""
+    for name in ("one", "two"):
+        (tmp_path / name).mkdir()
+        for i in range(3):
+            (tmp_path / name / f"{i}.txt").write_text(f"{name}{i}")
+    pools: list[object] = []
+    real_executor = expand_module.ThreadPoolExecutor
+
+    def counting_executor(*args: Any, **kwargs: Any) -> Any:
+        pools.append(object())
+        return real_executor(*args, **kwargs)
+
+    content = f"[[{tmp_path / 'one'}/]] [[{tmp_path / 'two'}/]]"
+    with patch.object(expand_module, "ThreadPoolExecutor", counting_executor):
+        expanded, file_count = expand_references(content, Config(filter=False, exclude=[]))
+
+    assert file_count == 6
+    assert expanded.index("one2") < expanded.index("two0")
+    assert len(pools) == 1
@@ -0,0 +1,26 @@
+"""Tests for content filtering."""
+
+from ask.filter import filter_content
+
+
+def test_filter_uses_extension_over_content() -> None:
+    """A Python file keeps // operators even when it mentions /*."""
+    content = 'half = total // 2  # integer division\npattern = "src/*.py"\n'
+
+    filtered = filter_content(content, "calc.py")
+
+    assert filtered == 'half = total // 2\npattern = "src/*.py"'
+
+
+def test_filter_detects_style_from_content_for_unknown_extension() -> None:
+    """Unknown extensions fall back to content-based detection."""
+    content = "kept\n<!--\nnote\n-->\nalso kept\n"
+
+    assert filter_content(content, "page.vue") == "kept\nalso kept"
+
+
+def test_filter_strips_leading_docstring_and_license_headers() -> None:
+    """Stacked headers are removed, including a module docstring."""
+    content = '/* License */\n"""Module docstring."""\n\nimport os\n'
+
+    assert filter_content(content, "mod.py") == "import os"
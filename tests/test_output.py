@@ -0,0 +1,29 @@
+"""Tests for output formatting."""
+
+import io
+
+import pytest
+
+from ask.output import Output
+
+
+def test_output_can_be_created_without_stdout(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Creating Output (done at import) doesn't touch a missing sys.stdout."""
+    monkeypatch.setattr("sys.stdout", None)
+
+    Output()
+
+
+def test_output_buffers_lines_when_not_a_terminal(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Off a terminal, lines are written without a flush per line."""
+    stream = io.StringIO()
+    flushes: list[None] = []
+    monkeypatch.setattr(stream, "flush", lambda: flushes.append(None))
+    monkeypatch.setattr("sys.stdout", stream)
+    out = Output()
+
+    out.info("one")
+    out.info("two")
+
+    assert stream.getvalue() == "one\ntwo\n"
+    assert flushes == []
@@ -1,6 +1,6 @@
 """Tests for session parser."""
 
-from ask.parser import count_input_markers, find_input_marker, parse_turns
+from ask.parser import count_input_markers, find_input_marker, find_last_turn, parse_turns
 
 
 def test_parse_basic_two_turn_conversation() -> None:
@@ -188,9 +188,11 @@ _
     result = find_input_marker(content)
 
     assert result is not None
-    line_idx, _ = result
+    line_idx, char_pos = result
     # Should find the marker outside the fence, not inside
     assert line_idx == 8
+    assert content[char_pos:].startswith("_\n")
+    assert content[:char_pos].endswith("below:\n\n")
 
 
 def test_count_input_markers() -> None:
@@ -219,3 +221,51 @@ No marker here.
 """
     count = count_input_markers(content)
     assert count == 0
+
+
+def test_parsers_share_work_on_the_same_content() -> None:
+    """Repeated parsing of one session agrees, and new content is reparsed."""
+    content = "# [1] Human\n\n```\n# [2] AI\n```\n_\n"
+
+    assert len(parse_turns(content)) == 1
+    assert find_input_marker(content) == (5, content.index("_\n"))
+    assert count_input_markers(content) == 1
+
+    edited = content.replace("```\n# [2] AI\n```\n", "")
+    assert find_input_marker(edited) == (2, edited.index("_\n"))
+
+
+def test_find_last_turn_ai() -> None:
+    """Find the last AI turn, unwrapped, ignoring headers in code fences."""
+    content = """# [1] Human
+
+Question?
+
+# [2] AI
+
+``````markdown
+First answer.
+``````
+
+# [3] Human
+
+```markdown
+# [4] AI
+```
+
+_
+"""
+    turn = find_last_turn(content, "AI")
+
+    assert turn is not None
+    assert turn.number == 2
+    assert turn.content == "First answer."
+
+
+def test_find_last_turn_missing() -> None:
+    """No matching turn returns None."""
+    content = """# [1] Human
+
+Question?
+"""
+    assert find_last_turn(content, "AI") is None
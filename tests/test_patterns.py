@@ -0,0 +1,35 @@
+"""Tests for path pattern matching."""
+
+from pathlib import Path
+
+import pytest
+
+from ask.patterns import resolve_file_path
+
+
+def test_resolve_file_path_matches_case_insensitively(tmp_path: Path) -> None:
+    """A path with the wrong case resolves to the existing file."""
+    (tmp_path / "Notes.md").write_text("x")
+
+    assert resolve_file_path(str(tmp_path / "notes.MD")) == tmp_path / "Notes.md"
+
+
+def test_resolve_file_path_sees_files_added_after_a_miss(tmp_path: Path) -> None:
+    """A cached directory listing does not hide newly created files."""
+    (tmp_path / "a.py").write_text("a")
+    with pytest.raises(FileNotFoundError):
+        resolve_file_path(str(tmp_path / "B.py"))
+
+    (tmp_path / "b.py").write_text("b")
+
+    assert resolve_file_path(str(tmp_path / "B.py")) == tmp_path / "b.py"
+
+
+def test_resolve_file_path_relists_when_cached_listing_is_stale(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A stale cache entry (same directory stat in a coarse tick) can't hide a file."""
+    (tmp_path / "c.py").write_text("c")
+    monkeypatch.setattr("ask.patterns._cached_dir_index", lambda *_: {})
+
+    assert resolve_file_path(str(tmp_path / "C.py")) == tmp_path / "c.py"
@@ -1,6 +1,7 @@
 """Tests for refresh logic."""
 
 import tempfile
+import threading
 from pathlib import Path
 from unittest.mock import patch
 
@@ -290,6 +291,74 @@ old b
         assert result.files_refreshed == 2
 
 
+def test_refresh_directory_replaces_nested_file_blocks_once() -> None:
+    """Nested file blocks are refreshed as part of their directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        (Path(tmpdir) / "a.py").write_text("# a longer body than the old one\n" * 3)
+
+        content = f"""intro
+<!-- dir: {tmpdir}/ -->
+<!-- file: {tmpdir}/a.py -->
+old
+<!-- /file -->
+<!-- /dir -->
+tail
+"""
+        config = Config(filter=False, exclude=[])
+        new_content, result = refresh_content(content, config=config)
+
+        assert new_content.startswith("intro\n")
+        assert new_content.endswith("\ntail\n")
+        assert new_content.count("<!-- /dir -->") == 1
+        assert new_content.count("<!-- /file -->") == 1
+        assert result.dirs_refreshed == 1
+        assert result.files_refreshed == 0
+
+
+def test_refresh_nested_file_when_directory_keeps_old_content() -> None:
+    """If a directory can't be refreshed, its file blocks still are."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        (Path(tmpdir) / "a.py").write_text("# new a")
+
+        content = f"""<!-- dir: {tmpdir}/ -->
+<!-- file: {tmpdir}/a.py -->
+# old a
+<!-- /file -->
+<!-- /dir -->
+"""
+        config = Config(filter=False, exclude=[])
+        with patch("ask.refresh.expand_directory", side_effect=RuntimeError("boom")):
+            new_content, result = refresh_content(content, config=config)
+
+        assert "# new a" in new_content
+        assert "# old a" not in new_content
+        assert result.files_refreshed == 1
+        assert result.errors == [f"{tmpdir}: boom"]
+
+
+def test_refresh_urls_concurrently() -> None:
+    """URL blocks are fetched in parallel rather than one after another."""
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_expand_url(url: str, config: Config) -> tuple[str, int]:
+        barrier.wait()
+        return f"<!-- url: {url} -->\nfresh\n<!-- /url -->", 1
+
+    content = """<!-- url: https://a.example -->
+old
+<!-- /url -->
+<!-- url: https://b.example -->
+old
+<!-- /url -->
+"""
+    with patch("ask.refresh.expand_url", side_effect=fake_expand_url):
+        new_content, result = refresh_content(content, include_urls=True, config=Config())
+
+    assert result.errors == []
+    assert result.urls_refreshed == 2
+    assert "old" not in new_content
+
+
 def test_refresh_dry_run_does_not_modify() -> None:
     """Dry run does not modify file."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -377,6 +446,32 @@ content
     assert len(file_blocks) == 2
 
 
+def test_find_markers_in_order_of_appearance() -> None:
+    """Blocks of all types are returned by position."""
+    content = """<!-- url: https://example.com -->
+page
+<!-- /url -->
+<!-- dir: src/**/ -->
+<!-- file: src/a.py -->
+a
+<!-- /file -->
+<!-- /dir -->
+<!-- file: b.py -->
+b
+<!-- /file -->
+"""
+    blocks = find_marker_blocks(content, include_urls=True)
+
+    assert [(b.type, b.reference) for b in blocks] == [
+        ("url", "https://example.com"),
+        ("dir", "src"),
+        ("file", "src/a.py"),
+        ("file", "b.py"),
+    ]
+    assert blocks[1].is_recursive
+    assert content[blocks[3].start : blocks[3].end].endswith("<!-- /file -->")
+
+
 def test_refresh_empty_directory() -> None:
     """Empty directory shows appropriate message."""
     with tempfile.TemporaryDirectory() as tmpdir:
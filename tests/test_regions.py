@@ -1,6 +1,6 @@
 """Tests for region detection."""
 
-from ask.regions import find_excluded_regions, is_in_excluded_region
+from ask.regions import build_excluded_mask, find_excluded_regions, is_in_excluded_region
 
 
 def test_finds_code_fence_regions() -> None:
@@ -23,6 +23,24 @@ def test_finds_code_fence_regions() -> None:
     assert regions[0].end == 4
 
 
+def test_code_fence_closes_only_on_long_enough_bare_fence() -> None:
+    """A shorter fence or a fence with an info string does not close the region."""
+    lines = [
+        "````markdown",
+        "```python",
+        "```",
+        "```` not a closer",
+        "````  ",
+        "after",
+    ]
+
+    regions = find_excluded_regions(lines)
+
+    assert len(regions) == 1
+    assert regions[0].start == 0
+    assert regions[0].end == 4
+
+
 def test_finds_expanded_file_regions() -> None:
     """Expanded file regions should be detected."""
     lines = [
@@ -63,3 +81,24 @@ def test_is_in_excluded_region() -> None:
     assert is_in_excluded_region(2, regions)
     assert is_in_excluded_region(3, regions)
     assert is_in_excluded_region(4, regions)
+
+
+def test_build_excluded_mask_matches_regions() -> None:
+    """The mask marks exactly the lines is_in_excluded_region reports."""
+    lines = [
+        "before",
+        "```",
+        "inside",
+        "```",
+        "between",
+        "<!-- file: a.py -->",
+        "unclosed",
+    ]
+    regions = find_excluded_regions(lines)
+
+    mask = build_excluded_mask(lines, regions)
+
+    assert len(mask) == len(lines)
+    assert [bool(flag) for flag in mask] == [
+        is_in_excluded_region(i, regions) for i in range(len(lines))
+    ]
@@ -1,13 +1,17 @@
 """Tests for session management."""
 
+import os
 import tempfile
+from collections.abc import Callable
 from pathlib import Path
 
 import pytest
 
 from ask.errors import ParseError
 from ask.session import (
+    SessionEditor,
     SessionWriter,
+    insert_block,
     read_session,
     turns_to_messages,
     validate_session,
@@ -258,3 +262,63 @@ Question?
     # Should be unchanged
     assert result == original
     assert "# [2] AI" not in result
+
+
+def test_session_writer_batches_flushes(tmp_path: Path) -> None:
+    """Chunks written between flushes reach disk no later than end()."""
+    path = tmp_path / "session.md"
+    path.write_text("# [1] Human\n\nQuestion?\n", encoding="utf-8")
+
+    writer = SessionWriter(str(path), next_turn_number=2)
+    writer.write("first ")
+    assert "first" in path.read_text(encoding="utf-8")
+
+    writer.write("second")
+    writer.end()
+
+    assert "first second" in path.read_text(encoding="utf-8")
+
+
+def test_insert_block_after_machine_blocks() -> None:
+    """insert_block places the block after existing machine blocks."""
+    content = """# [1] Human
+
+<!-- ask:applied -->
+| src/a.py | created | 1B |
+<!-- /ask:applied -->
+
+Text.
+
+_
+"""
+    result = insert_block(content, "BLOCK", after_machine_blocks=True)
+
+    assert result.index("<!-- /ask:applied -->") < result.index("BLOCK") < result.index("Text.")
+    assert result.endswith("BLOCK\n\nText.\n\n_\n")
+
+
+def test_session_editor_writes_on_exit(make_session: Callable[..., Path]) -> None:
+    """SessionEditor applies accumulated edits in a single write on exit."""
+    session_path = make_session()
+
+    with SessionEditor(str(session_path)) as editor:
+        editor.insert_block("<!-- ask:applied -->\n<!-- /ask:applied -->")
+        editor.insert_block("<!-- ask:check -->\n<!-- /ask:check -->", after_machine_blocks=True)
+        assert "ask:applied" not in session_path.read_text()
+
+    result = session_path.read_text()
+    assert result.index("ask:applied") < result.index("ask:check") < result.index("\n_\n")
+
+
+def test_session_editor_replays_on_external_change(make_session: Callable[..., Path]) -> None:
+    """Edits are replayed when the file changes on disk while editing."""
+    session_path = make_session()
+
+    with SessionEditor(str(session_path)) as editor:
+        editor.insert_block("BLOCK")
+        session_path.write_text(session_path.read_text().replace("Question?", "Edited?"))
+        os.utime(session_path, ns=(0, 0))
+
+    result = session_path.read_text()
+    assert "Edited?" in result
+    assert "BLOCK" in result